@@ -2,11 +2,13 @@
 import requests
 import re
 from config import GEMINI_API_KEY, GEMINI_ENDPOINT
+from system.tracing import traced
 
 class GeminiClient:
     def __init__(self):
         pass
     
+    @traced("gemini")
     def query_gemini(self, prompt, conversation_history):
         if not GEMINI_API_KEY:
             return "Gemini API key not set. Please configure GEMINI_API_KEY."
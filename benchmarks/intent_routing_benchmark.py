@@ -0,0 +1,165 @@
+# benchmarks/intent_routing_benchmark.py
+"""Replays stored and synthetic commands through handle_intent routing with stubbed handlers.
+
+Run from the repository root:
+
+    python -m benchmarks.intent_routing_benchmark
+    python -m benchmarks.intent_routing_benchmark --save-baseline routing.json
+    python -m benchmarks.intent_routing_benchmark --baseline routing.json   # after a router change
+
+Reports how commands were routed, routing throughput and per-intent
+latency. Synthetic commands carry the intent they should reach, and a
+saved baseline shows every command whose routing changed.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import timing_table
+from config import MEMORY_FILE
+from intents.intent_router import IntentRouter
+from intents.intent_table import INTENTS
+from system.tracing import get_tracer
+
+# Paraphrases of real commands with the intent each one should reach
+SYNTHETIC_COMMANDS = [
+    ("what's the status of my search", "search_status"),
+    ("cancel search", "cancel_search"),
+    ("stop the search for invoices", "cancel_search"),
+    ("what are you working on", "job_status"),
+    ("get files with invoice", "file_search"),
+    ("find file containing budget", "file_search"),
+    ("search for resume in files", "file_search"),
+    ("open number 3", "file_open"),
+    ("show all", "file_open"),
+    ("send email to vikas", "email_create"),
+    ("compose email to soumika", "email_create"),
+    ("send followup to tinku", "email_quick"),
+    ("write an email for the team to read", "email_create_fallback"),
+    ("list contacts", "list_contacts"),
+    ("shutdown the laptop", "shutdown"),
+    ("what should i study today", "study_schedule"),
+    ("show study plan", "show_study_plan"),
+    ("create study plan for physics exam on december 15", "create_study_plan"),
+    ("delete study plan", "clear_study_plan"),
+    ("search narendra modi", "google_search"),
+    ("google python decorators", "google_search"),
+    ("tell me about the eiffel tower", "wikipedia"),
+    ("weather in hyderabad", "weather"),
+    ("remind me to drink water in 10 minutes", "add_reminder"),
+    ("show reminders", "list_reminders"),
+    ("clear reminders", "clear_reminders"),
+    ("list history for today", "list_history"),
+    ("clear history", "clear_history"),
+    ("play playlist", "play_playlist"),
+    ("play believer", "play_song"),
+    ("open youtube", "open_website"),
+    ("open chatgpt", "open_website"),
+    ("what is the time", "date_time"),
+    ("what's the date tomorrow", "date_time"),
+    ("how are you", "how_are_you"),
+    ("who are you", "who_are_you"),
+    ("what is your name", "your_name"),
+    ("any holiday today", "holidays"),
+    ("goodbye", "goodbye"),
+    ("explain quantum entanglement simply", "gemini"),
+]
+
+
+def load_memory_commands(path=MEMORY_FILE):
+    if not os.path.exists(path):
+        return []
+    with open(path, "r") as f:
+        data = json.load(f)
+    days = data.values() if isinstance(data, dict) else [data]
+    return [turn["q"] for day in days for turn in day if turn.get("q")]
+
+
+def build_assistant():
+    """A FridayAssistant with no services whose intent handlers just return their handler name."""
+    from main import FridayAssistant
+    assistant = FridayAssistant.__new__(FridayAssistant)
+    assistant.router = IntentRouter.from_table(INTENTS, lambda handler: (lambda text: handler))
+    return assistant
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--memory-file", default=MEMORY_FILE)
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the corpus for timing")
+    parser.add_argument("--baseline", help="routing decisions JSON to compare against")
+    parser.add_argument("--save-baseline", help="write this run's routing decisions to a JSON file")
+    parser.add_argument("--show", action="store_true", help="print the routing decision for every command")
+    args = parser.parse_args()
+
+    # Time the router itself, without writing a trace span per routing
+    get_tracer().enabled = False
+    assistant = build_assistant()
+    corpus = [(text, None) for text in load_memory_commands(args.memory_file)] + SYNTHETIC_COMMANDS
+    print(f"Corpus: {len(corpus)} commands ({len(corpus) - len(SYNTHETIC_COMMANDS)} from memory, "
+          f"{len(SYNTHETIC_COMMANDS)} synthetic)")
+
+    # Routing decisions
+    decisions = {}
+    counts = {}
+    wrong = []
+    for text, expected in corpus:
+        intent = assistant.router.route(text.lower().strip())
+        decisions[text] = intent.name
+        counts[intent.name] = counts.get(intent.name, 0) + 1
+        if expected and intent.name != expected:
+            wrong.append((text, expected, intent.name))
+        if args.show:
+            print(f"  {intent.name:<22} <- {text}")
+
+    print("\nRouting decisions:")
+    for name, count in sorted(counts.items(), key=lambda item: -item[1]):
+        print(f"  {name:<22}{count:>6}")
+
+    if wrong:
+        print(f"\n❌ {len(wrong)} synthetic commands routed unexpectedly:")
+        for text, expected, actual in wrong:
+            print(f"  '{text}': expected {expected}, got {actual}")
+    else:
+        print("\n✅ All synthetic commands routed as expected")
+
+    # Throughput and per-intent latency through handle_intent
+    samples = {}
+    texts = [text for text, _ in corpus]
+    start = time.perf_counter()
+    for _ in range(args.repeat):
+        for text in texts:
+            begin = time.perf_counter()
+            assistant.handle_intent(text)
+            samples.setdefault(decisions[text], []).append(time.perf_counter() - begin)
+    elapsed = time.perf_counter() - start
+    total = args.repeat * len(texts)
+    print(f"\n{total} routings in {elapsed:.3f}s ({total / elapsed:,.0f} commands/s)")
+    print(timing_table(samples, label="intent"))
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(decisions, f, indent=2, sort_keys=True)
+        print(f"\nSaved {len(decisions)} routing decisions to {args.save_baseline}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        drift = [(text, baseline[text], name) for text, name in decisions.items()
+                 if text in baseline and baseline[text] != name]
+        if drift:
+            print(f"\n⚠️ {len(drift)} commands changed routing since the baseline:")
+            for text, before, after in drift:
+                print(f"  '{text}': {before} -> {after}")
+        else:
+            print(f"\n✅ No routing drift against {args.baseline}")
+
+    return 1 if wrong else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
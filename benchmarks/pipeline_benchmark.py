@@ -0,0 +1,152 @@
+# benchmarks/pipeline_benchmark.py
+"""Replays scripted voice turns through the full listen -> recognize -> intent -> speak loop.
+
+Run from the repository root:
+
+    python -m benchmarks.pipeline_benchmark --turns 300
+    python -m benchmarks.pipeline_benchmark --wav-dir recordings/   # real WAVs, one per phrase
+
+Recognition is stubbed with the scripted transcripts and speech output is
+silent, so the numbers show the assistant's own overhead per stage.
+"""
+import argparse
+import math
+import os
+import struct
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.stats import timing_table
+from speech.audio_source import WavReplaySource
+from speech.recognition_backends import ScriptedBackend
+from speech.speech_recognition import SpeechRecognizer
+from speech.text_to_speech import TextToSpeech
+from speech.tts_backends import BackendSelector, SilentBackend
+from speech.wake_word import KeywordSpotter
+from system.tracing import get_tracer, summarize
+
+# Commands that are answered locally, so no network call skews the timings
+COMMANDS = [
+    "what is the time",
+    "what is the date today",
+    "how are you",
+    "who are you",
+    "what is your name",
+    "list reminders",
+    "list contacts",
+    "list history today",
+]
+
+
+class StageTimer:
+    def __init__(self):
+        self.samples = {}
+
+    def wrap(self, obj, method_name, stage):
+        original = getattr(obj, method_name)
+
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                self.samples.setdefault(stage, []).append(time.perf_counter() - start)
+
+        setattr(obj, method_name, timed)
+
+    def report(self):
+        return timing_table(self.samples)
+
+
+def write_tone_wav(path, seconds, frequency, sample_rate=16000):
+    """Synthetic stand-in for a recorded phrase: silence, a tone, silence."""
+    import wave
+    samples = []
+    total = int(seconds * sample_rate)
+    for i in range(total):
+        in_tone = 0.15 * total < i < 0.85 * total
+        value = int(8000 * math.sin(2 * math.pi * frequency * i / sample_rate)) if in_tone else 0
+        samples.append(struct.pack("<h", value))
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(b"".join(samples))
+
+
+def build_script(turns, wav_dir, work_dir):
+    """Alternate wake and command phrases; every third turn is one-shot ("friday, <command>")."""
+    if wav_dir:
+        wavs = sorted(os.path.join(wav_dir, name) for name in os.listdir(wav_dir) if name.endswith(".wav"))
+        if not wavs:
+            raise SystemExit(f"No .wav files in {wav_dir}")
+    else:
+        wavs = []
+        for i, frequency in enumerate((300, 500, 700)):
+            path = os.path.join(work_dir, f"phrase_{i}.wav")
+            write_tone_wav(path, 1.0 + 0.5 * i, frequency)
+            wavs.append(path)
+
+    audio, transcripts = [], []
+    for turn in range(turns):
+        command = COMMANDS[turn % len(COMMANDS)]
+        if turn % 3 == 2:
+            audio.append(wavs[turn % len(wavs)])
+            transcripts.append(f"friday {command}")
+        else:
+            audio.extend([wavs[turn % len(wavs)], wavs[(turn + 1) % len(wavs)]])
+            transcripts.extend(["hey friday", command])
+    return audio, transcripts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--wav-dir", help="directory of recorded WAV phrases to replay")
+    args = parser.parse_args()
+
+    from main import FridayAssistant
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        # Keep benchmark spans out of the real trace file
+        tracer = get_tracer()
+        tracer.path = os.path.join(work_dir, "trace.jsonl")
+        audio, transcripts = build_script(args.turns, args.wav_dir, work_dir)
+        recognizer = SpeechRecognizer(
+            source=WavReplaySource(audio),
+            backend=ScriptedBackend(transcripts),
+            # No templates: the wake word goes through the (scripted) recognizer
+            spotter=KeywordSpotter(template_dir=os.path.join(work_dir, "no_templates")),
+        )
+        tts = TextToSpeech(selector=BackendSelector(SilentBackend()))
+        assistant = FridayAssistant(speech_recognizer=recognizer, tts=tts)
+        assistant.memory_manager.memory_file = os.path.join(work_dir, "memory.json")
+
+        timer = StageTimer()
+        timer.wrap(recognizer.source, "listen", "listen")
+        timer.wrap(recognizer.backend, "recognize", "recognize")
+        timer.wrap(assistant, "handle_intent", "intent")
+        timer.wrap(tts, "_speak_now", "speak")
+        timer.wrap(assistant, "process_turn", "turn")
+
+        start = time.perf_counter()
+        turns = 0
+        while assistant.process_turn():
+            turns += 1
+        tts.wait_until_idle()
+        elapsed = time.perf_counter() - start
+        spans = tracer.load_spans()
+
+    print()
+    print(f"{turns} turns in {elapsed:.2f}s ({turns / elapsed:.1f} turns/s)")
+    print(timer.report())
+    print()
+    print("Trace spans:")
+    print(summarize(spans))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+# benchmarks/startup_report.py
+"""Summarizes `python -X importtime` for main.py and times launch to the spoken greeting.
+
+Run from the repository root:
+
+    python -m benchmarks.startup_report
+    python -m benchmarks.startup_report --module speech.speech_recognition --top 30
+
+Each measurement runs in a fresh interpreter so nothing is already imported
+(modules Python itself loads at startup, like site, are left out).
+Speech output is silent, so the greeting time is the assistant's own startup.
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utilities.stats import percentile
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Prints seconds from the first line to the end of import, construction and greeting
+GREETING_SNIPPET = """
+import time
+start = time.perf_counter()
+import main
+from speech.text_to_speech import TextToSpeech
+from speech.tts_backends import BackendSelector, SilentBackend
+imported = time.perf_counter()
+assistant = main.FridayAssistant(tts=TextToSpeech(selector=BackendSelector(SilentBackend())))
+built = time.perf_counter()
+assistant.greet_user()
+assistant.tts.wait_until_idle()
+greeted = time.perf_counter()
+print(imported - start, built - start, greeted - start)
+"""
+
+
+def run_python(args):
+    # Tracing off, so profiling runs don't add spans to the real trace file
+    env = dict(os.environ, FRIDAY_TRACE="0")
+    result = subprocess.run([sys.executable] + args, cwd=REPO_ROOT, env=env, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise SystemExit(f"Python failed:\n{result.stderr[-2000:]}")
+    return result
+
+
+def parse_importtime(stderr):
+    """[(module, self_us, cumulative_us, depth)] from -X importtime output."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip())) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def import_report(module, top):
+    rows = parse_importtime(run_python(["-X", "importtime", "-c", f"import {module}"]).stderr)
+    # Keep only the module's own import tree: its children are listed right before it
+    end = max((i for i, row in enumerate(rows) if row[0] == module and row[3] == 0), default=None)
+    if end is None:
+        raise SystemExit(f"{module} was already imported at startup")
+    start = end
+    while start > 0 and rows[start - 1][3] > 0:
+        start -= 1
+    rows = rows[start:end + 1]
+    total = rows[-1][2]
+
+    packages = {}
+    for name, self_us, _, _ in rows:
+        package = name.split(".")[0]
+        packages[package] = packages.get(package, 0) + self_us
+
+    lines = [f"import {module}: {total / 1000:.1f} ms in {len(rows)} modules", "",
+             f"{'package (self time summed)':<40}{'ms':>10}{'share':>8}"]
+    for package, us in sorted(packages.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"{package:<40}{us / 1000:>10.1f}{100.0 * us / max(total, 1):>7.1f}%")
+
+    lines += ["", f"{'slowest modules (cumulative)':<40}{'ms':>10}"]
+    for name, _, cumulative_us, depth in sorted(rows, key=lambda row: -row[2])[:top]:
+        lines.append(f"{'  ' * min(depth, 4) + name:<40}{cumulative_us / 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def greeting_report(runs):
+    samples = {"import main": [], "assistant built": [], "greeting spoken": []}
+    for _ in range(runs):
+        output = run_python(["-c", GREETING_SNIPPET]).stdout.strip().splitlines()[-1]
+        for key, value in zip(samples, output.split()):
+            samples[key].append(float(value))
+
+    lines = [f"Launch to greeting over {runs} fresh interpreters:",
+             f"{'milestone':<24}{'p50 ms':>10}{'max ms':>10}"]
+    for key, values in samples.items():
+        values.sort()
+        lines.append(f"{key:<24}{1000 * percentile(values, 50):>10.1f}{1000 * values[-1]:>10.1f}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--module", default="main", help="module whose import is profiled")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--runs", type=int, default=5, help="interpreters started for the greeting timing")
+    args = parser.parse_args()
+
+    print(import_report(args.module, args.top))
+    print()
+    print(greeting_report(args.runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,15 @@
+# benchmarks/stats.py
+from utilities.stats import percentile
+
+
+def timing_table(samples, label="stage"):
+    """Format {name: [seconds, ...]} as a count/mean/p50/p95/max table in milliseconds."""
+    lines = [f"{label:<24}{'count':>8}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}"]
+    for name, values in samples.items():
+        values = sorted(values)
+        lines.append(
+            f"{name:<24}{len(values):>8}{1000 * sum(values) / len(values):>10.3f}"
+            f"{1000 * percentile(values, 50):>10.3f}{1000 * percentile(values, 95):>10.3f}"
+            f"{1000 * values[-1]:>10.3f}"
+        )
+    return "\n".join(lines)
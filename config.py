@@ -15,6 +15,19 @@ MEMORY_FILE = "friday_memory.json"
 REMINDER_FILE = "reminders.json"
 STUDY_PLAN_FILE = "study_plan.json"
 CONTACTS_FILE = "contacts.json"
+JSON_STORE_FLUSH_DELAY = 0.5  # seconds; a burst of changes to one file becomes a single write
+TOPIC_CACHE_FILE = "topic_cache.json"
+TOPIC_CACHE_TTL_DAYS = 30
+TOPIC_CACHE_MAX_ENTRIES = 200
+TOPIC_FETCH_DEADLINE = 12  # seconds to wait for Google and Gemini topics before using what arrived
+TOPIC_FETCH_WORKERS = 4  # subjects fetched in parallel
+
+# Study plan scheduling
+STUDY_HOURS_PER_DAY = 4.0
+STUDY_START_TIME = "09:00"
+STUDY_BREAK_MINUTES = 15
+STUDY_HOURS_PER_TOPIC = 1.5  # for a medium subject; scaled by difficulty
+STUDY_SESSION_HOURS = 0.5  # sessions are whole multiples of this
 
 # Email Configuration - USING OS ENVIRONMENT VARIABLES
 EMAIL_CONFIG = {
@@ -24,5 +37,42 @@ EMAIL_CONFIG = {
     'sender_password': os.getenv("SENDER_PASSWORD")  # From .bashrc
 }
 
+# Text to speech: "auto" picks per utterance, "gtts" or "local" forces one backend
+TTS_BACKEND = os.getenv("FRIDAY_TTS_BACKEND", "auto")
+TTS_SHORT_TEXT_WORDS = 5        # utterances this short are spoken locally
+TTS_LATENCY_BUDGET = 1.5        # seconds; slower gTTS synthesis switches to local
+TTS_FAILURE_COOLDOWN = 60       # seconds to avoid gTTS after a failure
+TTS_CACHE_SIZE = 64             # synthesized sentences kept for instant replay
+
+# Offline wake word: WAV recordings of "Friday" (python -m speech.wake_word record)
+WAKE_WORD_TEMPLATE_DIR = "wake_word_templates"
+WAKE_WORD_THRESHOLD = float(os.getenv("WAKE_WORD_THRESHOLD")) if os.getenv("WAKE_WORD_THRESHOLD") else None
+
+# Voice activity detection for ending a phrase
+VAD_HANGOVER_MS = int(os.getenv("VAD_HANGOVER_MS", "400"))   # silence that ends a phrase
+VAD_PADDING_MS = 150                                        # silence kept around the speech
+VAD_AGGRESSIVENESS = 2                                      # webrtcvad mode, 0 (lenient) - 3 (strict)
+
+# Speech recognition: engines raced in parallel (those not installed are skipped)
+RECOGNITION_BACKENDS = os.getenv("FRIDAY_STT_BACKENDS", "google,vosk,sphinx").split(",")
+RECOGNITION_DEADLINE = 4.0          # seconds to wait for a confident result
+RECOGNITION_MIN_CONFIDENCE = 0.6
+VOSK_MODEL_PATH = os.getenv("VOSK_MODEL_PATH", "vosk-model")
+
+# Headless batch mode (python main.py --batch commands.jsonl)
+BATCH_WORKERS = int(os.getenv("FRIDAY_BATCH_WORKERS", "4"))
+
+# Background jobs (file search, study plan creation, email sending)
+JOB_WORKERS = 2
+
+# Startup warm-up tasks (stores, recognizer, TTS cache) run in parallel with listening
+STARTUP_WORKERS = 4
+
+# Per-stage latency tracing (python -m system.tracing prints p50/p95 per stage)
+TRACE_ENABLED = os.getenv("FRIDAY_TRACE", "1") != "0"
+TRACE_FILE = "friday_trace.jsonl"
+TRACE_MAX_BYTES = 1_000_000
+TRACE_BACKUP_COUNT = 3
+
 # Other Configuration
 COUNTRY_CODE = "IN"
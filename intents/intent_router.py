@@ -0,0 +1,144 @@
+# intents/intent_router.py
+from collections import deque
+
+
+class PhraseMatcher:
+    """Aho-Corasick automaton: finds every registered phrase in one pass over the text."""
+
+    def __init__(self):
+        self._goto = [{}]
+        self._fail = [0]
+        self._phrases = [[]]
+        self._output = [[]]
+        self._compiled = True
+
+    def add(self, phrase, value):
+        state = 0
+        for char in phrase:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._phrases.append([])
+                self._output.append([])
+            state = next_state
+        self._phrases[state].append((len(phrase), value))
+        self._compiled = False
+
+    def compile(self):
+        queue = deque(self._goto[0].values())
+        for state in queue:
+            self._fail[state] = 0
+            self._output[state] = list(self._phrases[state])
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                # A state also reports every phrase that ends at its failure state
+                self._output[next_state] = self._phrases[next_state] + self._output[self._fail[next_state]]
+        self._compiled = True
+
+    def find_all(self, text):
+        """Yield (start_index, value) for every phrase occurrence in text."""
+        if not self._compiled:
+            self.compile()
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            for length, value in output[state]:
+                yield index - length + 1, value
+
+
+class Intent:
+    def __init__(self, name, priority, handler=None, response=None,
+                 contains=(), prefixes=(), all_of=()):
+        self.name = name
+        self.priority = priority
+        self.handler = handler
+        self.response = response
+        self.contains = tuple(contains)
+        self.prefixes = tuple(prefixes)
+        self.all_of = tuple(all_of)
+
+    def run(self, text):
+        if self.handler is None:
+            return self.response
+        return self.handler(text)
+
+
+class IntentRouter:
+    """Maps a command to the highest priority intent whose trigger phrases match.
+
+    An intent matches when any of its `contains` phrases occurs in the text,
+    any of its `prefixes` starts the text, or all of its `all_of` phrases
+    occur. All phrases of all intents are compiled into one Aho-Corasick
+    matcher, so routing is a single scan of the text. Lower priority
+    numbers win; by default intents keep their registration order.
+    """
+
+    def __init__(self):
+        self.intents = []
+        self.fallback = None
+        self._matcher = PhraseMatcher()
+
+    def register(self, name, handler=None, response=None, contains=(), prefixes=(), all_of=(), priority=None):
+        if priority is None:
+            priority = len(self.intents)
+        intent = Intent(name, priority, handler, response, contains, prefixes, all_of)
+        self.intents.append(intent)
+        for phrase in intent.contains:
+            self._matcher.add(phrase, (intent, "contains", phrase))
+        for phrase in intent.prefixes:
+            self._matcher.add(phrase, (intent, "prefix", phrase))
+        for phrase in intent.all_of:
+            self._matcher.add(phrase, (intent, "all_of", phrase))
+        return intent
+
+    def set_fallback(self, name, handler):
+        self.fallback = Intent(name, float("inf"), handler)
+
+    @classmethod
+    def from_table(cls, table, resolve):
+        """Build a router from intent table entries, resolving handler names with resolve(name)."""
+        router = cls()
+        for entry in table:
+            handler = resolve(entry["handler"]) if entry.get("handler") else None
+            if entry.get("fallback"):
+                router.set_fallback(entry["name"], handler)
+                continue
+            router.register(
+                entry["name"], handler=handler, response=entry.get("response"),
+                contains=entry.get("contains", ()), prefixes=entry.get("prefixes", ()),
+                all_of=entry.get("all_of", ()), priority=entry.get("priority"),
+            )
+        router._matcher.compile()
+        return router
+
+    def route(self, text):
+        """Return the Intent for text (the fallback when nothing matches)."""
+        best = None
+        all_of_hits = {}
+        for start, (intent, kind, phrase) in self._matcher.find_all(text):
+            if best is not None and intent.priority >= best.priority:
+                continue
+            if kind == "contains" or (kind == "prefix" and start == 0):
+                best = intent
+            elif kind == "all_of":
+                hits = all_of_hits.setdefault(id(intent), set())
+                hits.add(phrase)
+                if len(hits) == len(intent.all_of):
+                    best = intent
+        return best or self.fallback
+
+    def dispatch(self, text):
+        intent = self.route(text)
+        return intent.run(text) if intent else None
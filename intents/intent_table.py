@@ -0,0 +1,107 @@
+# intents/intent_table.py
+# Intents in priority order (first match wins). "handler" names a FridayAssistant
+# method that takes the command text; "response" is a fixed reply instead.
+# Phrases are substrings of the lower-cased command unless listed under
+# "prefixes" (must start the command) or "all_of" (every phrase must occur).
+
+INTENTS = [
+    # Background jobs (before file search so "search" here isn't a new search)
+    {"name": "search_status", "handler": "_intent_search_status",
+     "contains": ["status of my search", "status of the search", "search status", "is my search done",
+                  "search progress"]},
+    {"name": "cancel_search", "handler": "_intent_cancel_search",
+     "contains": ["cancel search", "cancel my search", "cancel the search",
+                  "stop search", "stop my search", "stop the search"]},
+    {"name": "job_status", "handler": "_intent_job_status",
+     "contains": ["what are you working on", "background jobs", "background tasks"]},
+
+    # File search
+    {"name": "file_search", "handler": "_handle_file_search",
+     "contains": ["get files with", "get file with", "get files containing",
+                  "find file", "search for", "where is", "look for", "find document"]},
+    {"name": "file_open", "handler": "_handle_file_open",
+     "prefixes": ["open number", "open file"], "contains": ["show all"]},
+
+    # Email
+    {"name": "email_create", "handler": "_handle_email_creation",
+     "contains": ["write email to", "compose email to", "create email to",
+                  "send email to", "email to", "mail to"]},
+    {"name": "email_quick", "handler": "_handle_quick_email",
+     "contains": ["send meeting email to", "send thank you email to", "send followup to"]},
+    {"name": "email_create_fallback", "handler": "_handle_email_creation",
+     "all_of": ["email", " to "]},
+
+    # Contacts and system
+    {"name": "list_contacts", "handler": "_intent_list_contacts", "contains": ["list contacts"]},
+    {"name": "shutdown", "handler": "_intent_shutdown",
+     "contains": ["shutdown", "power off", "turn off computer"]},
+
+    # Study planner
+    {"name": "study_schedule", "handler": "_intent_study_schedule",
+     "contains": ["today's study", "study schedule", "what should i study", "today study"]},
+    {"name": "show_study_plan", "handler": "_intent_show_study_plan",
+     "contains": ["show study plan", "view study plan", "display study plan"]},
+    {"name": "create_study_plan", "handler": "_handle_study_plan_creation",
+     "contains": ["create study plan", "make study schedule", "new study plan"]},
+    {"name": "clear_study_plan", "handler": "_intent_clear_study_plan",
+     "contains": ["clear study plan", "delete study plan", "remove study plan", "erase study plan"]},
+
+    # Web
+    {"name": "google_search", "handler": "_intent_google_search", "contains": ["search", "google"]},
+    {"name": "wikipedia", "handler": "_intent_wikipedia",
+     "contains": ["tell me about", "information about", "wikipedia"]},
+    {"name": "weather", "handler": "_intent_weather", "contains": ["weather"]},
+
+    # Reminders
+    {"name": "add_reminder", "handler": "_intent_add_reminder", "contains": ["remind me"]},
+    {"name": "list_reminders", "handler": "_intent_list_reminders",
+     "contains": ["list reminders", "show reminders", "what reminders"]},
+    {"name": "clear_reminders", "handler": "_intent_clear_reminders",
+     "contains": ["clear reminders", "delete all reminders", "remove all reminders"]},
+
+    # Memory
+    {"name": "list_history", "handler": "_handle_list_history", "contains": ["list history"]},
+    {"name": "clear_history", "handler": "_handle_memory_clear_interaction",
+     "contains": ["clear history", "delete history"]},
+
+    # Music
+    {"name": "play_playlist", "handler": "_intent_play_playlist", "contains": ["play playlist", "play all songs"]},
+    {"name": "play_song", "handler": "_intent_play_song", "prefixes": ["play "]},
+
+    # Websites
+    {"name": "open_website", "handler": "_intent_open_website",
+     "contains": ["open youtube", "open instagram", "open github", "open linkedin", "open chat gpt",
+                  "open chatgpt", "open gmail", "open whatsapp", "open aums"]},
+
+    # Date & time
+    {"name": "date_time", "handler": "_intent_date_time", "contains": ["date", "time"]},
+
+    # Small talk
+    {"name": "how_are_you", "response": "I'm great, thanks for asking!", "contains": ["how are you"]},
+    {"name": "who_are_you",
+     "response": "I am Friday, your personal AI assistant. I'm here to help you with tasks, searches, and more.",
+     "contains": ["who are you"]},
+    {"name": "your_name", "response": "My name is Friday.", "contains": ["what is your name"]},
+
+    # Holidays
+    {"name": "holidays", "handler": "_intent_holidays", "contains": ["holiday", "important day", "today special"]},
+
+    # Exit
+    {"name": "goodbye", "handler": "_intent_goodbye", "contains": ["goodbye", "bye"]},
+
+    # Gemini for everything else
+    {"name": "gemini", "handler": "_intent_gemini", "fallback": True},
+]
+
+# Spoken site names for the open_website intent, checked in this order
+WEBSITE_COMMANDS = {
+    "open youtube": "youtube",
+    "open instagram": "instagram",
+    "open github": "github",
+    "open linkedin": "linkedin",
+    "open chat gpt": "chat gpt",
+    "open chatgpt": "chat gpt",
+    "open gmail": "gmail",
+    "open whatsapp": "whatsapp",
+    "open aums": "aums",
+}
@@ -6,43 +6,82 @@ import sys
 import signal
 import threading
 import re
-import wikipedia
-from speech.speech_recognition import SpeechRecognizer
-from speech.text_to_speech import TextToSpeech
-from memory.memory_manager import MemoryManager
-from study_planner.study_planner import StudyPlanner
-from reminders.reminder_manager import ReminderManager
-from ai.gemini_client import GeminiClient
-from utilities.weather import WeatherService
-from utilities.web_search import WebSearch
-from utilities.calendar import CalendarService
-from utilities.music_player import MusicPlayer
-from utilities.email_manager import EmailManager
-from utilities.contact_manager import ContactManager
-from utilities.file_search import FileSearchManager
-from system.system_commands import SystemCommands
+import json
+import time
+import argparse
+import contextlib
+import importlib
+import queue
+from concurrent.futures import ThreadPoolExecutor, wait
+from speech.text_to_speech import TextToSpeech, CapturingTextToSpeech
+from system.job_executor import JobExecutor
+from system.startup import StartupOrchestrator
+from system.tracing import get_tracer, span
+from intents.intent_router import IntentRouter
+from intents.intent_table import INTENTS, WEBSITE_COMMANDS
+from config import BATCH_WORKERS
+
+
+# Phrases spoken in almost every conversation, synthesized during startup
+STARTUP_PHRASES = [
+    "Yes, how can I help you?",
+    "I didn't catch that. Please say it again.",
+    "I'm having trouble understanding. Let's go back to the main menu.",
+]
+
+
+class lazy_service:
+    """Class attribute that imports and builds a service on first access.
+
+    The instance is cached in the assistant's __dict__, so later lookups are
+    plain attribute reads, and assigning the attribute replaces the service.
+    Each service has its own lock, so different services can be built at once.
+    """
+
+    def __init__(self, module, class_name):
+        self.module = module
+        self.class_name = class_name
+        self.name = None
+        self._lock = threading.RLock()
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        # Background jobs and the voice loop may ask for the same service at once
+        with self._lock:
+            if self.name not in instance.__dict__:
+                service_class = getattr(importlib.import_module(self.module), self.class_name)
+                instance.__dict__[self.name] = service_class()
+            return instance.__dict__[self.name]
 
 
 class FridayAssistant:
-    def __init__(self):
-        self.speech_recognizer = SpeechRecognizer()
-        self.tts = TextToSpeech()
-        self.memory_manager = MemoryManager()
-        self.study_planner = StudyPlanner()
-        self.reminder_manager = ReminderManager()
-        self.gemini_client = GeminiClient()
-        self.weather_service = WeatherService()
-        self.web_search = WebSearch()
-        self.calendar_service = CalendarService()
-        self.music_player = MusicPlayer()
-        self.system_commands = SystemCommands()
-
-        # File Search Manager
-        self.file_search = FileSearchManager()
-
-        # Email and Contact managers
-        self.email_manager = EmailManager()
-        self.contact_manager = ContactManager()
+    # Services are imported and built on first use, so startup only pays for what it touches
+    speech_recognizer = lazy_service("speech.speech_recognition", "SpeechRecognizer")
+    memory_manager = lazy_service("memory.memory_manager", "MemoryManager")
+    study_planner = lazy_service("study_planner.study_planner", "StudyPlanner")
+    reminder_manager = lazy_service("reminders.reminder_manager", "ReminderManager")
+    gemini_client = lazy_service("ai.gemini_client", "GeminiClient")
+    weather_service = lazy_service("utilities.weather", "WeatherService")
+    web_search = lazy_service("utilities.web_search", "WebSearch")
+    calendar_service = lazy_service("utilities.calendar", "CalendarService")
+    music_player = lazy_service("utilities.music_player", "MusicPlayer")
+    system_commands = lazy_service("system.system_commands", "SystemCommands")
+    file_search = lazy_service("utilities.file_search", "FileSearchManager")
+    email_manager = lazy_service("utilities.email_manager", "EmailManager")
+    contact_manager = lazy_service("utilities.contact_manager", "ContactManager")
+
+    def __init__(self, speech_recognizer=None, tts=None, background_jobs=True):
+        # Both can be swapped out, e.g. for WAV replay and silent TTS in benchmarks
+        if speech_recognizer is not None:
+            self.speech_recognizer = speech_recognizer
+        self.tts = tts or TextToSpeech()
+
+        # Slow work (file search, study plans, email) runs here so Friday keeps listening
+        self.jobs = JobExecutor(self.tts, background=background_jobs)
 
         # Conversation state
         self.conversation_state = {
@@ -57,6 +96,9 @@ class FridayAssistant:
         self.last_search_keyword = ""
         self.in_file_selection_mode = False
 
+        # Command routing, see intents/intent_table.py
+        self.router = IntentRouter.from_table(INTENTS, lambda handler: getattr(self, handler))
+
     def greet_user(self):
         greeting = self.system_commands.get_greeting()
         self.tts.speak(greeting)
@@ -70,6 +112,11 @@ class FridayAssistant:
         }
         self.in_file_selection_mode = False
 
+    def listen_for_command(self):
+        # Let queued speech finish so the microphone doesn't pick up Friday's own voice
+        self.tts.wait_until_idle()
+        return self.speech_recognizer.listen_for_command()
+
     def listen_with_retry(self, context=None, prompt=None, max_retries=3):
         if context:
             self.conversation_state['active'] = True
@@ -111,7 +158,7 @@ class FridayAssistant:
                 else:
                     self.tts.speak("I didn't catch that. Please say it again.")
 
-            command = self.speech_recognizer.listen_for_command()
+            command = self.listen_for_command()
             if command:
                 self.reset_conversation_state()
                 return command
@@ -175,24 +222,14 @@ class FridayAssistant:
                         break
 
         if subject_name and exam_date:
-            self.tts.speak(f"Creating study plan for {subject_name} with exam on {exam_date}...")
-            study_plan = self.study_planner.create_study_plan_from_single_command(subject_name, exam_date)
-            if study_plan:
-                return f"Study plan created for {subject_name} with exam on {exam_date}. Found {len(study_plan['subjects'][0]['topics'])} topics to study."
-            else:
-                return "Failed to create study plan. Please try again."
+            return self._create_study_plan(subject_name, exam_date)
         elif subject_name and not exam_date:
             self.tts.speak(f"Got {subject_name}. When is the exam date? Please say something like 'December 15 2025'.")
             date_text = self.listen_with_retry(context="exam_date", max_retries=2)
             if date_text:
                 exam_date = self.study_planner.parse_spoken_date(date_text)
                 if exam_date:
-                    self.tts.speak(f"Creating study plan for {subject_name} with exam on {exam_date}...")
-                    study_plan = self.study_planner.create_study_plan_from_single_command(subject_name, exam_date)
-                    if study_plan:
-                        return f"Study plan created for {subject_name}."
-                    else:
-                        return "Failed to create study plan."
+                    return self._create_study_plan(subject_name, exam_date)
                 else:
                     return "Could not understand the exam date."
             else:
@@ -207,12 +244,7 @@ class FridayAssistant:
                 if date_text:
                     exam_date = self.study_planner.parse_spoken_date(date_text)
                     if exam_date:
-                        self.tts.speak(f"Creating study plan for {subject_name} with exam on {exam_date}...")
-                        study_plan = self.study_planner.create_study_plan_from_single_command(subject_name, exam_date)
-                        if study_plan:
-                            return f"Study plan created for {subject_name}."
-                        else:
-                            return "Failed to create study plan."
+                        return self._create_study_plan(subject_name, exam_date)
                     else:
                         return "Could not understand the exam date."
                 else:
@@ -220,6 +252,21 @@ class FridayAssistant:
             else:
                 return "No subject provided."
 
+    def _create_study_plan(self, subject_name, exam_date):
+        """Fetch topics and build the plan and PDF as a background job."""
+        def announce(study_plan, job):
+            if study_plan:
+                names = [name.lower() for name in self.study_planner.split_subjects(subject_name)]
+                topic_count = sum(len(s['topics']) for s in study_plan['subjects'] if s['name'].lower() in names)
+                return f"Study plan created for {subject_name} with exam on {exam_date}. Found {topic_count} topics to study."
+            return f"Failed to create the study plan for {subject_name}. Please try again."
+
+        return self.jobs.run(
+            "study plan", f"creating the study plan for {subject_name}",
+            lambda: self.study_planner.create_study_plan_from_single_command(subject_name, exam_date),
+            announce,
+        )
+
     def _handle_list_history(self, text):
         if "today" in text:
             return self.memory_manager.list_history("today")
@@ -312,7 +359,7 @@ class FridayAssistant:
 
         # Find or get email address
         self.tts.speak(f"Looking up email for {recipient_name}...")
-        recipient_email = self.contact_manager.find_email(recipient_name, self.tts)
+        recipient_email = self.contact_manager.find_email(recipient_name, self.tts, self.speech_recognizer)
 
         if not recipient_email:
             return f"Could not find or get email address for {recipient_name}."
@@ -330,8 +377,7 @@ class FridayAssistant:
             return "Email content is required."
 
         # Send immediately without confirmation
-        result = self.email_manager.send_email(recipient_email, subject, content)
-        return result
+        return self._send_email(recipient_name, recipient_email, subject, content)
 
     def _handle_quick_email(self, text):
         """Handle quick email with templates"""
@@ -353,7 +399,7 @@ class FridayAssistant:
                 return "I didn't catch the recipient name."
 
         # Find email
-        recipient_email = self.contact_manager.find_email(recipient_name, self.tts)
+        recipient_email = self.contact_manager.find_email(recipient_name, self.tts, self.speech_recognizer)
         if not recipient_email:
             return f"Could not find email for {recipient_name}."
 
@@ -377,8 +423,15 @@ class FridayAssistant:
         subject = subject_map.get(template_type, "Message")
 
         # Send immediately without confirmation
-        result = self.email_manager.send_email(recipient_email, subject, content)
-        return result
+        return self._send_email(recipient_name, recipient_email, subject, content)
+
+    def _send_email(self, recipient_name, recipient_email, subject, content):
+        """Send over SMTP as a background job; the result is announced when it's done."""
+        return self.jobs.run(
+            "email", f"sending the email to {recipient_name}",
+            lambda: self.email_manager.send_email(recipient_email, subject, content),
+            lambda result, job: result,
+        )
 
     # NEW: File Search Methods
     def _handle_file_search(self, text):
@@ -426,14 +479,19 @@ class FridayAssistant:
             else:
                 return "I need a keyword to search for."
 
-        self.tts.speak(f"Searching for '{keyword}' in your files. This may take a moment.")
         print(f"🔍 Searching for '{keyword}' in files...")
+        return self.jobs.run(
+            "search", f"searching your files for '{keyword}'",
+            lambda: self.file_search.search_files_by_content(keyword),
+            lambda results, job: self._search_results_text(keyword, results, job),
+            cancel=self.file_search.stop_search,
+            progress=lambda: f"{len(self.file_search.search_results)} files found so far",
+        )
 
-        # Perform search
-        results = self.file_search.search_files_by_content(keyword)
-
+    def _search_results_text(self, keyword, results, job=None):
+        prefix = "Search cancelled. " if job and job.cancel_requested else ""
         if not results:
-            return f"No files found containing '{keyword}'"
+            return f"{prefix}No files found containing '{keyword}'"
 
         # Store results for later selection
         self.last_search_results = results
@@ -441,10 +499,10 @@ class FridayAssistant:
 
         # Format results for display
         if len(results) > 10:
-            result_text = f"Found {len(results)} files. Showing first 10:\n\n"
+            result_text = f"{prefix}Found {len(results)} files. Showing first 10:\n\n"
             display_results = results[:10]
         else:
-            result_text = f"Found {len(results)} files:\n\n"
+            result_text = f"{prefix}Found {len(results)} files:\n\n"
             display_results = results
 
         for i, result in enumerate(display_results, 1):
@@ -492,206 +550,346 @@ class FridayAssistant:
 
     def handle_intent(self, text):
         text = (text or "").lower().strip()
+        with span("route"):
+            intent = self.router.route(text)
+        if intent is None:
+            return None
+        with span("handler", intent=intent.name):
+            return intent.run(text)
 
-        # NEW: File Search Commands - Updated pattern to "get files with"
-        if any(cmd in text for cmd in ["get files with", "get file with", "get files containing"]):
-            return self._handle_file_search(text)
+    # Intent handlers for the simple entries in intents/intent_table.py
+    def _intent_search_status(self, text):
+        return self.jobs.status("search")
 
-        elif any(cmd in text for cmd in ["find file", "search for", "where is", "look for", "find document"]):
-            return self._handle_file_search(text)
+    def _intent_cancel_search(self, text):
+        return self.jobs.cancel("search")
 
-        elif text.startswith("open number") or text.startswith("open file"):
-            return self._handle_file_open(text)
+    def _intent_job_status(self, text):
+        return self.jobs.status()
 
-        elif "show all" in text and hasattr(self, 'last_search_results'):
-            return self._handle_file_open(text)
+    def _intent_list_contacts(self, text):
+        return self.contact_manager.list_contacts()
 
-        # Email Commands
-        elif any(cmd in text for cmd in ["write email to", "compose email to", "create email to"]):
-            return self._handle_email_creation(text)
+    def _intent_shutdown(self, text):
+        return self.system_commands.shutdown_computer(self.tts)
 
-        elif any(cmd in text for cmd in ["send email to", "email to", "mail to"]):
-            return self._handle_email_creation(text)
+    def _intent_study_schedule(self, text):
+        schedule = self.study_planner.get_todays_study_schedule()
+        return schedule if schedule else "No study plan found. Please create a study plan first by saying 'create study plan'."
 
-        # Quick email templates
-        elif any(cmd in text for cmd in ["send meeting email to", "send thank you email to", "send followup to"]):
-            return self._handle_quick_email(text)
+    def _intent_show_study_plan(self, text):
+        study_plan = self.study_planner.load_study_plan()
+        if study_plan:
+            total_subjects = len(study_plan['subjects'])
+            total_days = study_plan['total_study_days']
+            hours_per_day = study_plan['available_hours_per_day']
+            return f"You have a study plan with {total_subjects} subjects over {total_days} days, studying {hours_per_day} hours daily. Say 'today's study schedule' for details."
+        else:
+            return "No study plan found. Say 'create study plan' to make one."
 
-        # Fallback - if it has "email" and "to" anywhere in the command
-        elif "email" in text and " to " in text:
-            return self._handle_email_creation(text)
+    def _intent_clear_study_plan(self, text):
+        return self.study_planner.clear_study_plan()
 
-        # Contact management
-        elif "list contacts" in text:
-            return self.contact_manager.list_contacts()
+    def _intent_google_search(self, text):
+        query = self.web_search.extract_search_query(text)
+        return self.web_search.google_search(query)
 
-        # Shutdown command
-        elif any(cmd in text for cmd in ["shutdown", "power off", "turn off computer"]):
-            return self.system_commands.shutdown_computer(self.tts)
+    def _intent_wikipedia(self, text):
+        topic = self.web_search.extract_topic_from_text(text)
+        return self.web_search.wikipedia_search(topic)
 
-        # Study Planner commands
-        elif any(cmd in text for cmd in ["today's study", "study schedule", "what should i study", "today study"]):
-            schedule = self.study_planner.get_todays_study_schedule()
-            return schedule if schedule else "No study plan found. Please create a study plan first by saying 'create study plan'."
+    def _intent_weather(self, text):
+        city = self._extract_city_from_text(text)
+        return self.weather_service.get_weather(city)
 
-        elif any(cmd in text for cmd in ["show study plan", "view study plan", "display study plan"]):
-            study_plan = self.study_planner.load_study_plan()
-            if study_plan:
-                total_subjects = len(study_plan['subjects'])
-                total_days = study_plan['total_study_days']
-                hours_per_day = study_plan['available_hours_per_day']
-                return f"You have a study plan with {total_subjects} subjects over {total_days} days, studying {hours_per_day} hours daily. Say 'today's study schedule' for details."
-            else:
-                return "No study plan found. Say 'create study plan' to make one."
+    def _intent_add_reminder(self, text):
+        return self.reminder_manager.add_reminder_from_text(text)
 
-        elif any(cmd in text for cmd in ["create study plan", "make study schedule", "new study plan"]):
-            return self._handle_study_plan_creation(text)
+    def _intent_list_reminders(self, text):
+        return self.reminder_manager.list_reminders_text()
 
-        elif any(phrase in text for phrase in
-                 ["clear study plan", "delete study plan", "remove study plan", "erase study plan"]):
-            return self.study_planner.clear_study_plan()
+    def _intent_clear_reminders(self, text):
+        return self.reminder_manager.clear_all_reminders()
 
-        # Google Search
-        elif "search" in text or "google" in text:
-            query = self.web_search.extract_search_query(text)
-            return self.web_search.google_search(query)
+    def _intent_play_playlist(self, text):
+        return self.music_player.play_playlist()
 
-        # Wikipedia
-        elif "tell me about" in text or "information about" in text or "wikipedia" in text:
-            topic = self.web_search.extract_topic_from_text(text)
-            return self.web_search.wikipedia_search(topic)
+    def _intent_play_song(self, text):
+        song = self.music_player.extract_song_name(text)
+        return self.music_player.play_song(song)
 
-        # Weather
-        elif "weather" in text:
-            city = self._extract_city_from_text(text)
-            return self.weather_service.get_weather(city)
-
-        # Reminders
-        elif "remind me" in text:
-            return self.reminder_manager.add_reminder_from_text(text)
-
-        elif any(cmd in text for cmd in ["list reminders", "show reminders", "what reminders"]):
-            return self.reminder_manager.list_reminders_text()
-
-        elif any(cmd in text for cmd in ["clear reminders", "delete all reminders", "remove all reminders"]):
-            return self.reminder_manager.clear_all_reminders()
-
-        # Memory commands
-        elif "list history" in text:
-            return self._handle_list_history(text)
-
-        elif "clear history" in text or "delete history" in text:
-            return self._handle_memory_clear_interaction(text)
-
-        # Music
-        elif "play playlist" in text or "play all songs" in text:
-            return self.music_player.play_playlist()
-
-        elif text.startswith("play "):
-            song = self.music_player.extract_song_name(text)
-            return self.music_player.play_song(song)
-
-        # Websites - INDIVIDUAL COMMANDS (more specific)
-        elif "open youtube" in text:
-            return self.web_search.open_website("youtube")
-        elif "open instagram" in text:
-            return self.web_search.open_website("instagram")
-        elif "open github" in text:
-            return self.web_search.open_website("github")
-        elif "open linkedin" in text:
-            return self.web_search.open_website("linkedin")
-        elif "open chat gpt" in text or "open chatgpt" in text:
-            return self.web_search.open_website("chat gpt")
-        elif "open gmail" in text:
-            return self.web_search.open_website("gmail")
-        elif "open whatsapp" in text:
-            return self.web_search.open_website("whatsapp")
-        elif "open aums" in text:
-            return self.web_search.open_website("aums")
-
-        # Date & Time
-        elif "date" in text or "time" in text:
-            return self.system_commands.get_date_time(text)
-
-        # Greetings
-        elif "how are you" in text:
-            return "I'm great, thanks for asking!"
-        elif "who are you" in text:
-            return "I am Friday, your personal AI assistant. I'm here to help you with tasks, searches, and more."
-        elif "what is your name" in text:
-            return "My name is Friday."
-
-        # Holidays
-        elif "holiday" in text or "important day" in text or "today special" in text:
-            return self.calendar_service.get_important_days()
-
-        # Exit
-        elif "goodbye" in text or "bye" in text:
-            response = "Goodbye, have a nice day, Friday going offline."
-            self.tts.speak(response)
-            sys.exit(0)
+    def _intent_open_website(self, text):
+        for phrase, site in WEBSITE_COMMANDS.items():
+            if phrase in text:
+                return self.web_search.open_website(site)
 
-        # Gemini fallback for everything else
-        else:
-            response = self.gemini_client.query_gemini(text, self.memory_manager.conversation_history)
-            if isinstance(response, str) and ("Gemini API error" in response or "did not return" in response):
-                try:
-                    info = wikipedia.summary(text, sentences=2)
-                    return info
-                except:
-                    return f"Could not find an answer. You can search online: https://www.google.com/search?q={text}"
-            return response
+    def _intent_date_time(self, text):
+        return self.system_commands.get_date_time(text)
+
+    def _intent_holidays(self, text):
+        return self.calendar_service.get_important_days()
+
+    def _intent_goodbye(self, text):
+        response = "Goodbye, have a nice day, Friday going offline."
+        self.tts.speak(response).result()
+        self.jobs.shutdown()
+        sys.exit(0)
+
+    def _intent_gemini(self, text):
+        response = self.gemini_client.query_gemini(text, self.memory_manager.conversation_history)
+        if isinstance(response, str) and ("Gemini API error" in response or "did not return" in response):
+            try:
+                import wikipedia
+                info = wikipedia.summary(text, sentences=2)
+                return info
+            except:
+                return f"Could not find an answer. You can search online: https://www.google.com/search?q={text}"
+        return response
 
     def run(self):
         signal.signal(signal.SIGINT, lambda sig, frame: sys.exit(0))
         self.greet_user()
-
-        # Start reminder checking thread
-        reminder_thread = threading.Thread(target=self.reminder_manager.check_reminders_loop, daemon=True)
+        self.start_warm_up()
+
+        while self.process_turn():
+            pass
+
+    def start_warm_up(self):
+        """Load stores, the recognizer and the TTS cache in parallel; listening doesn't wait for it."""
+        startup = StartupOrchestrator()
+        startup.add("study schedule", lambda: self.study_planner.remind_study_schedule(self.tts))
+        startup.add("reminders", self._start_reminder_thread)
+        startup.add("recognizer", self._warm_up_recognizer)
+        startup.add("memory", lambda: self.memory_manager)
+        startup.add("contacts", lambda: self.contact_manager)
+        startup.add("tts cache", lambda: self.tts.warm(STARTUP_PHRASES))
+        return startup.start()
+
+    def _start_reminder_thread(self):
+        reminder_thread = threading.Thread(target=self.reminder_manager.check_reminders_loop,
+                                           args=(self.tts,), daemon=True)
         reminder_thread.start()
 
-        # Remind about study schedule on startup
-        study_plan = self.study_planner.load_study_plan()
-        if study_plan:
-            self.study_planner.remind_study_schedule(self.tts)
+    def _warm_up_recognizer(self):
+        # Opens and calibrates the microphone while the greeting plays
+        source = self.speech_recognizer.source
+        if hasattr(source, "start"):
+            source.start()
+
+    def process_turn(self):
+        """One wake word -> command -> response round.
+
+        Returns False once the audio source has nothing more to give.
+        """
+        # Background speech (the startup schedule) keeps playing while waiting for the wake word
+        self.tts.wait_until_idle(include_background=False)
+        if self.in_file_selection_mode:
+            # A background search just read out its results; take the choice without the wake word
+            with get_tracer().turn(), self.tts.hold_background():
+                self._file_selection_followup()
+                self.tts.wait_until_idle()
+            return True
+        if not self.speech_recognizer.listen_for_wake_word():
+            return False
+
+        # Everything from the wake word to the reply shares one turn id in the trace,
+        # and background speech pauses until the conversation is over
+        with get_tracer().turn(), self.tts.hold_background():
+            self._handle_turn()
+            self.tts.wait_until_idle()
+        return True
+
+    def _handle_turn(self):
+        # "Friday, what's the time" - skip the acknowledgement and the second listen
+        command = self.speech_recognizer.take_followup_command()
+        if not command:
+            self.tts.speak("Yes, how can I help you?")
+            command = self.listen_for_command()
+        if not command:
+            return
+
+        self.reset_conversation_state()
+        response = self.handle_intent(command)
+
+        # Handle special cases that need voice interaction
+        if response and isinstance(response, dict) and "action" in response:
+            if response["action"] == "shutdown_confirmation":
+                confirmation = self.listen_with_retry(context="shutdown_confirmation", max_retries=2)
+                if confirmation and "yes" in confirmation.lower():
+                    shutdown_result = self.system_commands.execute_shutdown()
+                    self.tts.speak(shutdown_result)
+                else:
+                    self.tts.speak("Shutdown cancelled!")
+            return
 
+        if response:
+            self.memory_manager.add_to_memory(command, response)
+            self.tts.speak(response)
+
+            # NEW: Stay in conversation mode for file selection
+            if self.in_file_selection_mode:
+                self._file_selection_followup()
+
+    def _file_selection_followup(self):
+        self.tts.speak("What would you like to do with these files?")
+        follow_up_command = self.listen_for_command()
+        if follow_up_command:
+            follow_up_response = self.handle_intent(follow_up_command)
+            if follow_up_response:
+                self.memory_manager.add_to_memory(follow_up_command, follow_up_response)
+                self.tts.speak(follow_up_response)
+        # Exit file selection mode after handling follow-up
+        self.in_file_selection_mode = False
+
+    def run_text_command(self, command):
+        """Run one typed command through handle_intent; returns a JSON-ready result.
+
+        Meant for headless use with a CapturingTextToSpeech, so the result
+        also lists everything Friday said while handling the command.
+        """
+        text = (command or "").lower().strip()
+        intent = self.router.route(text)
+        start = time.perf_counter()
+        result = {"command": command, "intent": intent.name if intent else None}
+        try:
+            response = self.handle_intent(command)
+        except SystemExit:
+            # "bye" ends the voice loop; in batch mode it is just another reply
+            response = None
+            result["exit"] = True
+        except Exception as e:
+            response = None
+            result["error"] = str(e)
+        result["elapsed_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        result["response"] = response
+        if isinstance(self.tts, CapturingTextToSpeech):
+            result["spoken"] = self.tts.take_spoken()
+        return result
+
+
+# Intents that read or change state a neighbouring command may depend on (search results,
+# reminders, study plan, history, contacts); in batch mode they run alone and in input order
+BATCH_SERIAL_INTENTS = {
+    "file_search", "file_open", "search_status", "cancel_search",
+    "email_create", "email_quick", "email_create_fallback", "list_contacts",
+    "study_schedule", "show_study_plan", "create_study_plan", "clear_study_plan",
+    "add_reminder", "list_reminders", "clear_reminders", "list_history", "clear_history",
+}
+
+
+def read_batch_commands(lines):
+    """Yield (id, command) from JSONL lines ({"id": ..., "command" or "text": ...}) or plain text lines."""
+    for number, line in enumerate(lines, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except ValueError:
+            entry = line
+        if isinstance(entry, dict):
+            command = entry.get("command") or entry.get("text")
+            if not command:
+                print(f"⚠️ Skipping line {number}: no 'command' or 'text' field", file=sys.stderr)
+                continue
+            yield entry.get("id", number), command
+        else:
+            yield number, str(entry)
+
+
+def run_batch(input_file, output_file, workers=BATCH_WORKERS):
+    """Headless mode: answer commands from a JSONL stream and write one JSON result per line.
+
+    There is no microphone: prompts that wait for a spoken answer (email
+    confirmation, study plan questions, ...) get nothing and give up, and
+    speech is captured into the result instead of played.
+
+    Commands run on a worker pool and results are written in input order as
+    soon as they are ready, so a caller can keep stdin open and read answers
+    as it goes. Commands routed to BATCH_SERIAL_INTENTS (e.g. "open number 1"
+    after "get files with X") wait for everything before them and run alone,
+    so they see the state the earlier commands left behind.
+    """
+    from speech.speech_recognition import SpeechRecognizer
+    from speech.audio_source import WavReplaySource
+    from speech.recognition_backends import ScriptedBackend
+
+    tts = CapturingTextToSpeech()
+    recognizer = SpeechRecognizer(source=WavReplaySource([]), backend=ScriptedBackend([]))
+    # Slow intents run inline so each result line carries its real outcome
+    assistant = FridayAssistant(speech_recognizer=recognizer, tts=tts, background_jobs=False)
+
+    def run_one(item):
+        command_id, command = item
+        return {"id": command_id, **assistant.run_text_command(command)}
+
+    def runs_alone(command):
+        text = command.lower().strip()
+        # A bare number picks a file from the last search
+        return text.isdigit() or assistant.router.route(text).name in BATCH_SERIAL_INTENTS
+
+    workers = max(1, workers)
+    # Futures in input order; bounded so a fast reader can't run far ahead of the output
+    results = queue.Queue(maxsize=workers * 2)
+    count = 0
+
+    def write_results():
+        nonlocal count
         while True:
-            if self.speech_recognizer.listen_for_wake_word():
-                self.tts.speak("Yes, how can I help you?")
-                command = self.speech_recognizer.listen_for_command()
-                if command:
-                    self.reset_conversation_state()
-                    response = self.handle_intent(command)
-
-                    # Handle special cases that need voice interaction
-                    if response and isinstance(response, dict) and "action" in response:
-                        if response["action"] == "shutdown_confirmation":
-                            confirmation = self.listen_with_retry(context="shutdown_confirmation", max_retries=2)
-                            if confirmation and "yes" in confirmation.lower():
-                                shutdown_result = self.system_commands.execute_shutdown()
-                                self.tts.speak(shutdown_result)
-                            else:
-                                self.tts.speak("Shutdown cancelled!")
-                        continue
-
-                    if response:
-                        self.memory_manager.add_to_memory(command, response)
-                        self.tts.speak(response)
-
-                        # NEW: Stay in conversation mode for file selection
-                        if self.in_file_selection_mode:
-                            self.tts.speak("What would you like to do with these files?")
-                            follow_up_command = self.speech_recognizer.listen_for_command()
-                            if follow_up_command:
-                                follow_up_response = self.handle_intent(follow_up_command)
-                                if follow_up_response:
-                                    self.memory_manager.add_to_memory(follow_up_command, follow_up_response)
-                                    self.tts.speak(follow_up_response)
-                            # Exit file selection mode after handling follow-up
-                            self.in_file_selection_mode = False
+            future = results.get()
+            if future is None:
+                return
+            output_file.write(json.dumps(future.result(), default=str) + "\n")
+            output_file.flush()
+            count += 1
+
+    start = time.perf_counter()
+    # Handlers print progress; keep it off stdout so the JSONL output stays clean
+    with contextlib.redirect_stdout(sys.stderr), ThreadPoolExecutor(max_workers=workers) as pool:
+        writer = threading.Thread(target=write_results, daemon=True)
+        writer.start()
+        in_flight = []
+        for item in read_batch_commands(input_file):
+            alone = runs_alone(item[1])
+            if alone:
+                wait(in_flight)
+            future = pool.submit(run_one, item)
+            results.put(future)
+            if alone:
+                wait([future])
+                in_flight = []
+            else:
+                in_flight = [f for f in in_flight if not f.done()] + [future]
+        results.put(None)
+        writer.join()
+    elapsed = time.perf_counter() - start
+    print(f"✅ Processed {count} commands in {elapsed:.2f}s with {workers} workers", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Friday voice assistant")
+    parser.add_argument("--batch", nargs="?", const="-", metavar="FILE",
+                        help="answer commands from a JSONL/text file (or stdin) instead of the microphone")
+    parser.add_argument("--output", default="-", help="where batch results go (default: stdout)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS, help="parallel commands in batch mode")
+    args = parser.parse_args()
+
+    if args.batch is None:
+        assistant = FridayAssistant()
+        assistant.run()
+        return
+
+    input_file = sys.stdin if args.batch == "-" else open(args.batch, "r")
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w")
+    try:
+        run_batch(input_file, output_file, args.workers)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
 
 
 if __name__ == "__main__":
-    assistant = FridayAssistant()
-    assistant.run()
+    main()
 # [file content end]
\ No newline at end of file
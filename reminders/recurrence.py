@@ -0,0 +1,172 @@
+# reminders/recurrence.py
+import datetime
+import re
+
+WEEKDAYS = ["sunday", "monday", "tuesday", "wednesday", "thursday", "friday", "saturday"]
+
+
+class CronExpression:
+    """Standard 5-field cron: minute hour day-of-month month day-of-week (0 or 7 = Sunday).
+
+    Fields accept *, lists (1,15), ranges (1-5) and steps (*/15, 8-18/2).
+    As in cron, when both day fields are restricted either one may match.
+    """
+    FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+
+    def __init__(self, expr):
+        fields = expr.split()
+        if len(fields) != 5:
+            raise ValueError(f"Cron expression needs 5 fields: '{expr}'")
+        self.expr = " ".join(fields)
+        self.minutes, self.hours, self.days, self.months, weekdays = (
+            self._parse_field(field, low, high) for field, (low, high) in zip(fields, self.FIELD_RANGES)
+        )
+        self.weekdays = {day % 7 for day in weekdays}
+        self.any_day = fields[2] == "*"
+        self.any_weekday = fields[4] == "*"
+
+    @staticmethod
+    def _parse_field(field, low, high):
+        values = set()
+        for part in field.split(","):
+            step = 1
+            if "/" in part:
+                part, step = part.split("/", 1)
+                step = int(step)
+            if part == "*":
+                start, end = low, high
+            elif "-" in part:
+                start, end = (int(v) for v in part.split("-", 1))
+            else:
+                start = end = int(part)
+            if start < low or end > high or start > end or step < 1:
+                raise ValueError(f"Cron field '{field}' out of range {low}-{high}")
+            values.update(range(start, end + 1, step))
+        return values
+
+    def _day_matches(self, moment):
+        day_ok = moment.day in self.days
+        weekday_ok = (moment.isoweekday() % 7) in self.weekdays
+        if self.any_day or self.any_weekday:
+            return day_ok and weekday_ok
+        return day_ok or weekday_ok
+
+    def next_after(self, after, max_days=5 * 366):
+        """First matching minute strictly after `after`, or None if none within max_days."""
+        moment = after.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = after + datetime.timedelta(days=max_days)
+        while moment <= limit:
+            if moment.month not in self.months:
+                year, month = (moment.year + 1, 1) if moment.month == 12 else (moment.year, moment.month + 1)
+                moment = moment.replace(year=year, month=month, day=1, hour=0, minute=0)
+            elif not self._day_matches(moment):
+                moment = moment.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif moment.hour not in self.hours:
+                moment = moment.replace(minute=0) + datetime.timedelta(hours=1)
+            elif moment.minute not in self.minutes:
+                moment += datetime.timedelta(minutes=1)
+            else:
+                return moment
+        return None
+
+
+class Recurrence:
+    """A repeat rule stored once with its reminder: a cron expression or a fixed interval.
+
+    Only the next occurrence is ever computed, when the previous one fires.
+    """
+
+    def __init__(self, cron=None, every_minutes=None, label=""):
+        if (cron is None) == (every_minutes is None):
+            raise ValueError("A recurrence needs either a cron expression or an interval")
+        if every_minutes is not None and every_minutes <= 0:
+            raise ValueError("The repeat interval must be at least one minute")
+        self.cron = CronExpression(cron) if cron else None
+        self.every_minutes = every_minutes
+        self.label = label
+
+    def next_after(self, after):
+        if self.cron:
+            return self.cron.next_after(after)
+        return after + datetime.timedelta(minutes=self.every_minutes)
+
+    def to_dict(self):
+        rule = {"cron": self.cron.expr} if self.cron else {"every_minutes": self.every_minutes}
+        rule["label"] = self.label
+        return rule
+
+    @classmethod
+    def from_dict(cls, rule):
+        return cls(cron=rule.get("cron"), every_minutes=rule.get("every_minutes"), label=rule.get("label", ""))
+
+    @classmethod
+    def from_text(cls, text, parse_time):
+        """Recognize a spoken repeat rule; parse_time(text) -> datetime gives the time of day.
+
+        The rule must end the text (task, rule, optional time), so words like
+        "daily" inside the task ("submit the daily report at 5 pm") are left
+        to the one-shot parsers. The time of day may come after the rule
+        ("every day at 5 pm") or before it ("at 5 pm every day"). Returns (Recurrence, text without
+        the rule) or (None, text); raises ValueError for a rule that can't work.
+        """
+        lowered = text.lower()
+
+        match = re.search(r'\bcron\s+((?:\S+\s+){4}\S+)\s*$', lowered)
+        if match:
+            expr = match.group(1)
+            task = cls._reject_time_of_day(lowered[:match.start()].strip(), parse_time, "a cron schedule")
+            return cls(cron=expr, label=f"on schedule {expr}"), task
+
+        match = re.search(r'\bevery\s+(\d+\s+)?(minute|minutes|hour|hours)\b(?:\s+at\s+(.+))?\s*$', lowered)
+        if match:
+            count = int(match.group(1)) if match.group(1) else 1
+            if count < 1:
+                raise ValueError("the repeat interval must be at least one minute")
+            if match.group(3):
+                raise ValueError(f"a time of day like '{match.group(3)}' doesn't fit a repeat every few minutes or hours")
+            task = cls._reject_time_of_day(lowered[:match.start()].strip(), parse_time, "a repeat every few minutes or hours")
+            minutes = count * 60 if "hour" in match.group(2) else count
+            unit = match.group(2).rstrip("s")
+            label = f"every {count} {unit}s" if count > 1 else f"every {unit}"
+            return cls(every_minutes=minutes, label=label), task
+
+        match = re.search(r'\b(every day|daily|every weekday|on weekdays|weekdays|every weekend|on weekends'
+                          r'|every (?:' + "|".join(WEEKDAYS) + r'))\b(?:\s+at\s+(.+))?\s*$', lowered)
+        if not match:
+            return None, text
+        when, time_text = match.group(1), match.group(2)
+        task = lowered[:match.start()].strip()
+        if not time_text:
+            # "call mom at 5 pm every day": the time sits at the end of the task
+            time_text, task = cls._split_time_of_day(task, parse_time)
+        at = parse_time(time_text) if time_text else None
+        if time_text and at is None:
+            return None, text
+        hour, minute = (at.hour, at.minute) if at else (9, 0)
+
+        if when in ("every day", "daily"):
+            days, label = "*", "every day"
+        elif "weekday" in when:
+            days, label = "1-5", "every weekday"
+        elif "weekend" in when:
+            days, label = "0,6", "every weekend"
+        else:
+            day_name = when.split()[1]
+            days, label = str(WEEKDAYS.index(day_name)), f"every {day_name.capitalize()}"
+        at_text = datetime.time(hour, minute).strftime('%I:%M %p')
+        return cls(cron=f"{minute} {hour} * * {days}", label=f"{label} at {at_text}"), task
+
+    @staticmethod
+    def _split_time_of_day(task, parse_time):
+        """('call mom at 5 pm', ...) -> ('5 pm', 'call mom'); (None, task) if there is no time."""
+        match = re.search(r'\s+at\s+(.+)$', task)
+        if match and parse_time(match.group(1)):
+            return match.group(1), task[:match.start()].strip()
+        return None, task
+
+    @classmethod
+    def _reject_time_of_day(cls, task, parse_time, rule):
+        time_text, _ = cls._split_time_of_day(task, parse_time)
+        if time_text:
+            raise ValueError(f"a time of day like '{time_text}' doesn't fit {rule}")
+        return task
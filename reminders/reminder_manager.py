@@ -1,27 +1,35 @@
 # reminders/reminder_manager.py
-import json
 import datetime
 import re
-import time
-import os
+import threading
 from config import REMINDER_FILE
+from utilities.json_store import JsonStore
+from .reminder_scheduler import ReminderScheduler
+from .recurrence import Recurrence
 
 class ReminderManager:
     def __init__(self):
         self.reminder_file = REMINDER_FILE
+        self.store = JsonStore(self.reminder_file, default=list)
+        self.tts = None
+        self.lock = threading.Lock()
+        # Reminders live in memory; reminders.json is only written when they change
+        self.scheduler = ReminderScheduler(self._fire_reminder)
+        self.reminders = []
+        for reminder in self.load_reminders():
+            try:
+                reminder_time = datetime.datetime.fromisoformat(reminder["time"])
+            except (KeyError, TypeError, ValueError):
+                continue
+            self.reminders.append(reminder)
+            self._schedule(reminder, reminder_time)
     
     def load_reminders(self):
-        if os.path.exists(self.reminder_file):
-            try:
-                with open(self.reminder_file, "r") as f:
-                    return json.load(f)
-            except:
-                return []
-        return []
+        reminders = self.store.load()
+        return list(reminders) if isinstance(reminders, list) else []
     
     def save_reminders(self, reminders):
-        with open(self.reminder_file, "w") as f:
-            json.dump(reminders, f, indent=4)
+        self.store.save(list(reminders))
     
     def parse_time_from_text(self, time_text):
         now = datetime.datetime.now()
@@ -62,6 +70,20 @@ class ReminderManager:
         if not text or not isinstance(text, str):
             return "I couldn't understand the reminder command."
 
+        # recurring: "every day at 9 am", "every weekday at 8:30 am", "every 2 hours", "cron 0 9 * * 1-5"
+        repeat_match = re.search(r'.*remind me to (.+)', text, re.IGNORECASE)
+        if repeat_match:
+            try:
+                recurrence, task = Recurrence.from_text(repeat_match.group(1), self.parse_time_from_text)
+            except ValueError as e:
+                return f"I couldn't understand that schedule: {e}"
+            if recurrence and task:
+                reminder_dt = recurrence.next_after(datetime.datetime.now())
+                if reminder_dt is None:
+                    return "That schedule never comes up. Please try a different one."
+                self._add_reminder(task, reminder_dt, recurrence)
+                return f"Recurring reminder set for '{task}' {recurrence.label}. First one at {reminder_dt.strftime('%I:%M %p on %A')}"
+
         # relative
         rel_match = re.search(r'.*remind me to (.+?) in (\d+ (?:minute|minutes|hour|hours))', text, re.IGNORECASE)
         if rel_match:
@@ -70,9 +92,7 @@ class ReminderManager:
             reminder_dt = self.parse_time_from_text(f"in {time_text}")
             if not reminder_dt:
                 return "I couldn't understand the time for the reminder."
-            reminders = self.load_reminders()
-            reminders.append({"task": task, "time": reminder_dt.isoformat()})
-            self.save_reminders(reminders)
+            self._add_reminder(task, reminder_dt)
             return f"Reminder set for '{task}' at {reminder_dt.strftime('%I:%M %p')}"
 
         # absolute
@@ -86,48 +106,73 @@ class ReminderManager:
                 if re.search(r'\b(1[3-9]|2[0-3]|[01]?\d:[0-5]\d)\b', time_text):
                     return "Please give time in 12-hour format (e.g. '10:30 PM') or say 'in 10 minutes'. I don't accept 24-hour times like 21:30."
                 return "I couldn't understand the time. Please say something like 'at 9 PM' or 'in 10 minutes'."
-            reminders = self.load_reminders()
-            reminders.append({"task": task, "time": reminder_dt.isoformat()})
-            self.save_reminders(reminders)
+            self._add_reminder(task, reminder_dt)
             return f"Reminder set for '{task}' at {reminder_dt.strftime('%I:%M %p')}"
 
         return "I couldn't understand the reminder command."
 
+    def _add_reminder(self, task, reminder_dt, recurrence=None):
+        reminder = {"task": task, "time": reminder_dt.isoformat()}
+        if recurrence:
+            # The rule is stored once; "time" always holds just the next occurrence
+            reminder["repeat"] = recurrence.to_dict()
+        with self.lock:
+            self.reminders.append(reminder)
+            self.save_reminders(self.reminders)
+        self._schedule(reminder, reminder_dt)
+        return reminder
+
+    def _schedule(self, reminder, reminder_dt):
+        if "repeat" in reminder:
+            self.scheduler.schedule_recurring(reminder_dt, reminder)
+        else:
+            self.scheduler.schedule(reminder_dt, reminder)
+
     def list_reminders_text(self):
-        reminders = self.load_reminders()
+        with self.lock:
+            reminders = list(self.reminders)
         if not reminders:
             return "You have no reminders set."
         lines = []
         for i, r in enumerate(reminders, start=1):
             dt = datetime.datetime.fromisoformat(r["time"])
-            lines.append(f"{i}. {r['task']} at {dt.strftime('%I:%M %p')}")
+            if "repeat" in r:
+                lines.append(f"{i}. {r['task']} {r['repeat'].get('label', 'repeating')}, next at {dt.strftime('%I:%M %p')}")
+            else:
+                lines.append(f"{i}. {r['task']} at {dt.strftime('%I:%M %p')}")
         return "\n".join(lines)
 
-    def check_reminders_loop(self):
-        from speech.text_to_speech import TextToSpeech
-        tts = TextToSpeech()
-        
-        while True:
-            now = datetime.datetime.now()
-            reminders = self.load_reminders()
-            changed = False
-            for reminder in reminders[:]:
-                try:
-                    reminder_time = datetime.datetime.fromisoformat(reminder["time"])
-                except:
-                    reminders.remove(reminder)
-                    changed = True
-                    continue
-                if now >= reminder_time:
-                    msg = f"Hi, it's time to {reminder['task']}"
-                    print("⏰ Reminder triggered:", reminder['task'], "scheduled for", reminder_time)
-                    tts.speak(msg)
-                    reminders.remove(reminder)
-                    changed = True
-            if changed:
-                self.save_reminders(reminders)
-            time.sleep(20)
+    def check_reminders_loop(self, tts=None):
+        """Speak reminders as they fall due; blocks, so run it on a thread."""
+        if tts is None:
+            from speech.text_to_speech import TextToSpeech
+            tts = TextToSpeech()
+        self.tts = tts
+        self.scheduler.run()
+
+    def _fire_reminder(self, reminder):
+        next_dt = None
+        scheduled_for = reminder["time"]
+        with self.lock:
+            if not any(r is reminder for r in self.reminders):
+                return  # cleared in the meantime
+            if "repeat" in reminder:
+                # Next occurrence only now; occurrences missed while Friday was off are skipped
+                next_dt = Recurrence.from_dict(reminder["repeat"]).next_after(datetime.datetime.now())
+            if next_dt:
+                reminder["time"] = next_dt.isoformat()
+            else:
+                self.reminders = [r for r in self.reminders if r is not reminder]
+            self.save_reminders(self.reminders)
+        if next_dt:
+            self.scheduler.schedule_recurring(next_dt, reminder)
+        msg = f"Hi, it's time to {reminder['task']}"
+        print("⏰ Reminder triggered:", reminder['task'], "scheduled for", scheduled_for)
+        self.tts.speak_reminder(msg)
 
     def clear_all_reminders(self):
-        self.save_reminders([])
+        with self.lock:
+            self.reminders = []
+            self.save_reminders([])
+        self.scheduler.clear()
         return "All reminders cleared."
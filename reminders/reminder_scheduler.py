@@ -0,0 +1,105 @@
+# reminders/reminder_scheduler.py
+import heapq
+import itertools
+import threading
+import time
+from .timing_wheel import Bucket, TimingWheel
+
+# Longest single sleep; a cheap re-check in case the wall clock jumped (suspend, DST, NTP)
+MAX_SLEEP = 60.0
+
+
+class ReminderScheduler:
+    """Fires reminders at their due time from an in-memory min-heap.
+
+    run() sleeps on a Condition until the earliest due time, and schedule()
+    or clear() wake it up, so there is no polling and no file I/O while
+    idle. Due times are wall-clock timestamps (time.time()).
+
+    Recurring reminders go on a hierarchical timing wheel instead: the heap
+    then only holds the wheel's buckets, so tens of thousands of rules cost
+    O(1) to schedule and don't grow the heap. A bucket's timers move to the
+    heap once they are due within a second, and fire from there exactly.
+    """
+
+    def __init__(self, on_due):
+        self.on_due = on_due
+        self._heap = []
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._running = False
+        self._wheel = self._new_wheel()
+
+    def _new_wheel(self):
+        return TimingWheel(self._push, tick=1.0, wheel_size=60, start=time.time())
+
+    def _push(self, due, item):
+        heapq.heappush(self._heap, (due, next(self._counter), item))
+        # Only an earlier head changes how long run() should sleep
+        if self._heap[0][2] is item:
+            self._condition.notify()
+
+    def schedule(self, due, item):
+        """Fire on_due(item) at `due` (a timestamp or datetime)."""
+        if hasattr(due, "timestamp"):
+            due = due.timestamp()
+        with self._condition:
+            self._push(due, item)
+
+    def schedule_recurring(self, due, item):
+        """Like schedule(), for the next occurrence of a recurring reminder."""
+        if hasattr(due, "timestamp"):
+            due = due.timestamp()
+        with self._condition:
+            self._wheel.advance(time.time())
+            if not self._wheel.add(due, item):
+                self._push(due, item)
+
+    def clear(self):
+        with self._condition:
+            self._heap = []
+            self._wheel = self._new_wheel()
+            self._condition.notify()
+
+    def __len__(self):
+        with self._condition:
+            return len(self._heap)
+
+    def next_due(self):
+        with self._condition:
+            return self._heap[0][0] if self._heap else None
+
+    def run(self):
+        self._running = True
+        while self._running:
+            with self._condition:
+                due_items = self._pop_due()
+                if not due_items:
+                    delay = self._heap[0][0] - time.time() if self._heap else None
+                    self._condition.wait(MAX_SLEEP if delay is None else min(delay, MAX_SLEEP))
+                    continue
+            for item in due_items:
+                try:
+                    self.on_due(item)
+                except Exception as e:
+                    print(f"❌ Reminder failed: {e}")
+
+    def stop(self):
+        with self._condition:
+            self._running = False
+            self._condition.notify()
+
+    def _pop_due(self):
+        now = time.time()
+        due_items = []
+        while self._heap and self._heap[0][0] <= now:
+            expiration, _, item = heapq.heappop(self._heap)
+            if isinstance(item, Bucket):
+                # Cascade the bucket's timers to finer levels, or onto the heap when nearly due
+                self._wheel.advance(expiration)
+                for due, timer in item.flush():
+                    if not self._wheel.add(due, timer):
+                        self._push(due, timer)
+            else:
+                due_items.append(item)
+        return due_items
@@ -0,0 +1,69 @@
+# reminders/timing_wheel.py
+import math
+
+
+class Bucket:
+    """Timers whose due times fall in one slot of a wheel, flushed together when the slot comes up."""
+
+    def __init__(self):
+        self.expiration = None
+        self.timers = []
+
+    def add(self, due, item):
+        self.timers.append((due, item))
+
+    def set_expiration(self, expiration):
+        """Returns True when the bucket starts a new round and must be (re)queued."""
+        if self.expiration == expiration:
+            return False
+        self.expiration = expiration
+        return True
+
+    def flush(self):
+        timers, self.timers, self.expiration = self.timers, [], None
+        return timers
+
+
+class TimingWheel:
+    """Hierarchical timing wheel (a wheel of `wheel_size` slots per level, coarser levels made on demand).
+
+    Adding a timer is O(1) and only buckets, never individual timers, are
+    handed to on_bucket(expiration, bucket) to be waited on, so the waiting
+    side holds at most levels x wheel_size entries however many timers there
+    are. When a bucket expires the owner calls advance() and re-adds its
+    timers; they drop to finer levels until add() reports them as due within
+    one tick.
+    """
+
+    def __init__(self, on_bucket, tick=1.0, wheel_size=60, start=0.0):
+        self.on_bucket = on_bucket
+        self.tick = tick
+        self.wheel_size = wheel_size
+        self.interval = tick * wheel_size
+        self.current_time = math.floor(start / tick) * tick
+        self.buckets = [Bucket() for _ in range(wheel_size)]
+        self.overflow = None
+
+    def add(self, due, item):
+        """Place a timer; returns False when it is due within one tick and should be handled directly."""
+        if due < self.current_time + self.tick:
+            return False
+        if due < self.current_time + self.interval:
+            virtual_id = math.floor(due / self.tick)
+            bucket = self.buckets[virtual_id % self.wheel_size]
+            bucket.add(due, item)
+            if bucket.set_expiration(virtual_id * self.tick):
+                self.on_bucket(bucket.expiration, bucket)
+            return True
+        if self.overflow is None:
+            self.overflow = TimingWheel(self.on_bucket, self.interval, self.wheel_size, self.current_time)
+        return self.overflow.add(due, item)
+
+    def advance(self, now):
+        if now >= self.current_time + self.tick:
+            self.current_time = math.floor(now / self.tick) * self.tick
+            if self.overflow is not None:
+                self.overflow.advance(self.current_time)
+
+    def levels(self):
+        return 1 + (self.overflow.levels() if self.overflow else 0)
@@ -0,0 +1,200 @@
+# speech/audio_capture.py
+import audioop
+import collections
+import math
+import threading
+import time
+import speech_recognition as sr
+from config import VAD_HANGOVER_MS, VAD_PADDING_MS
+from .audio_source import AudioSource
+from .endpointer import Endpointer
+from system.tracing import span
+
+
+class AudioCapture(AudioSource):
+    """One long-lived microphone stream shared by wake-word, command and email listening.
+
+    A background thread keeps reading chunks into a ring buffer and keeps the
+    recognizer's energy threshold calibrated on quiet chunks, so listeners
+    never reopen the microphone or wait for adjust_for_ambient_noise.
+    """
+
+    def __init__(self, source=None, recognizer=None, buffer_seconds=30, calibration_seconds=1.0,
+                 hangover_ms=VAD_HANGOVER_MS, padding_ms=VAD_PADDING_MS):
+        super().__init__()
+        self.source = source
+        if recognizer is not None:
+            self.recognizer = recognizer
+        self.buffer_seconds = buffer_seconds
+        self.calibration_seconds = calibration_seconds
+        self.hangover_ms = hangover_ms
+        self.padding_ms = padding_ms
+        self.calibrated = threading.Event()
+        self._frames = None
+        self._next_index = 0
+        self._condition = threading.Condition()
+        self._thread = None
+        self._running = False
+
+    @property
+    def sample_rate(self):
+        return self.source.SAMPLE_RATE
+
+    @property
+    def sample_width(self):
+        return self.source.SAMPLE_WIDTH
+
+    @property
+    def seconds_per_buffer(self):
+        return float(self.source.CHUNK) / self.source.SAMPLE_RATE
+
+    def start(self):
+        # The startup warm-up and the first listen() may both get here; only one may open the microphone
+        with self._condition:
+            if self._running:
+                return
+            if self.source is None:
+                self.source = sr.Microphone()
+            max_chunks = int(math.ceil(self.buffer_seconds / self.seconds_per_buffer))
+            self._frames = collections.deque(maxlen=max_chunks)
+            self._running = True
+            self._thread = threading.Thread(target=self._run, daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._running = False
+        if self._thread:
+            self._thread.join(timeout=2)
+
+    def _run(self):
+        with self.source as source:
+            calibration_left = self.calibration_seconds
+            while self._running:
+                buffer = source.stream.read(source.CHUNK)
+                if len(buffer) == 0:
+                    break
+                energy = audioop.rms(buffer, source.SAMPLE_WIDTH)
+
+                if calibration_left > 0:
+                    self._adjust_threshold(energy)
+                    calibration_left -= self.seconds_per_buffer
+                    if calibration_left <= 0:
+                        print(f"🎚️ Microphone calibrated (energy threshold {self.recognizer.energy_threshold:.0f})")
+                        self.calibrated.set()
+                elif energy <= self.recognizer.energy_threshold:
+                    # Keep tracking ambient noise on chunks without speech
+                    self._adjust_threshold(energy)
+
+                with self._condition:
+                    self._frames.append((self._next_index, buffer, energy))
+                    self._next_index += 1
+                    self._condition.notify_all()
+
+        self._running = False
+        self.calibrated.set()
+        with self._condition:
+            self._condition.notify_all()
+
+    def _adjust_threshold(self, energy):
+        # Same asymmetric weighted average speech_recognition uses
+        recognizer = self.recognizer
+        damping = recognizer.dynamic_energy_adjustment_damping ** self.seconds_per_buffer
+        target_energy = energy * recognizer.dynamic_energy_ratio
+        recognizer.energy_threshold = recognizer.energy_threshold * damping + target_energy * (1 - damping)
+
+    def current_index(self):
+        with self._condition:
+            return self._next_index
+
+    def read_chunk(self, index, deadline=None):
+        """Return (index, buffer, energy) for the chunk at index or the oldest one still buffered.
+
+        Returns None when the deadline passes or the stream has ended.
+        """
+        with self._condition:
+            while True:
+                if self._frames and index < self._next_index:
+                    oldest = self._frames[0][0]
+                    return self._frames[max(index, oldest) - oldest]
+                if not self._running:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        """Capture the next phrase spoken from now on.
+
+        Speech is detected per chunk by the VAD endpointer and the phrase
+        ends after VAD_HANGOVER_MS of non-speech, instead of the recognizer's
+        longer pause threshold. Only VAD_PADDING_MS of silence is kept on
+        each side, so recognition gets compact audio as soon as speech ends.
+        """
+        self.start()
+        if not self.calibrated.is_set():
+            with span("mic_calibration"):
+                self.calibrated.wait()
+
+        recognizer = self.recognizer
+        endpointer = Endpointer(self.sample_rate, self.sample_width)
+        hangover_count = int(math.ceil(self.hangover_ms / 1000.0 / self.seconds_per_buffer))
+        phrase_count_min = int(math.ceil(recognizer.phrase_threshold / self.seconds_per_buffer))
+        padding_count = int(math.ceil(self.padding_ms / 1000.0 / self.seconds_per_buffer))
+
+        index = self.current_index()
+        wait_deadline = None if not timeout else time.monotonic() + timeout
+        while True:
+            # Wait for speech, keeping a little audio from before it started
+            frames = collections.deque(maxlen=max(1, padding_count + 1))
+            while True:
+                chunk = self.read_chunk(index, wait_deadline)
+                if chunk is None:
+                    if not self._running:
+                        return None
+                    raise sr.WaitTimeoutError("listening timed out while waiting for phrase to start")
+                index, buffer, energy = chunk
+                index += 1
+                frames.append(buffer)
+                if endpointer.is_speech(buffer, recognizer.energy_threshold, energy):
+                    break
+
+            frames = collections.deque(frames)
+            phrase_start = time.monotonic()
+            pause_count, phrase_count = 0, 0
+            while True:
+                if phrase_time_limit and time.monotonic() - phrase_start > phrase_time_limit:
+                    break
+                chunk = self.read_chunk(index)
+                if chunk is None:
+                    break
+                index, buffer, energy = chunk
+                index += 1
+                frames.append(buffer)
+                phrase_count += 1
+                if endpointer.is_speech(buffer, recognizer.energy_threshold, energy):
+                    pause_count = 0
+                else:
+                    pause_count += 1
+                if pause_count >= hangover_count:
+                    break
+
+            phrase_count -= pause_count
+            if phrase_count >= phrase_count_min or not self._running:
+                break
+
+        # Trim trailing silence down to the padding
+        for _ in range(pause_count - padding_count):
+            frames.pop()
+        return sr.AudioData(b"".join(frames), self.sample_rate, self.sample_width)
+
+
+_capture = None
+
+
+def get_audio_capture():
+    """Shared capture, so the microphone is opened and calibrated once per process."""
+    global _capture
+    if _capture is None:
+        _capture = AudioCapture()
+    return _capture
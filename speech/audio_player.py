@@ -0,0 +1,216 @@
+# speech/audio_player.py
+import io
+import os
+import platform
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+
+# Players that can read encoded audio from stdin, in order of preference
+PIPE_PLAYERS = {
+    "mp3": [
+        ["mpg123", "-q", "-"],
+        ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"],
+        ["mpv", "--no-terminal", "--no-video", "-"],
+    ],
+    "wav": [
+        ["aplay", "-q", "-"],
+        ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet", "-"],
+        ["mpv", "--no-terminal", "--no-video", "-"],
+    ],
+}
+
+
+# Players that take raw PCM on stdin and stay open between utterances,
+# with the sample format names they use for 1, 2 and 4 byte samples
+STREAM_PLAYERS = [
+    (["aplay", "-q", "-t", "raw", "--buffer-time=100000", "-f", "{format}", "-r", "{rate}", "-c", "{channels}", "-"],
+     {1: "U8", 2: "S16_LE", 4: "S32_LE"}),
+    (["pacat", "--raw", "--latency-msec=100", "--format={format}", "--rate={rate}", "--channels={channels}"],
+     {1: "u8", 2: "s16le", 4: "s32le"}),
+]
+
+
+class PCMStream:
+    """One long-lived player process; each utterance's PCM is written to its stdin.
+
+    The process is only restarted when the sample format changes or it
+    dies. The player never says when it has drained, so play() sleeps for
+    the length of the audio it just wrote.
+    """
+
+    def __init__(self, template, formats):
+        self.template = template
+        self.formats = formats
+        self.lock = threading.Lock()
+        self.process = None
+        self.params = None
+        self.busy_until = 0.0
+
+    def supports(self, sample_width):
+        return sample_width in self.formats
+
+    def play(self, frames, rate, channels, sample_width):
+        params = (rate, channels, sample_width)
+        with self.lock:
+            if self.process is None or self.process.poll() is not None or params != self.params:
+                self._open(params)
+            try:
+                self.process.stdin.write(frames)
+                self.process.stdin.flush()
+            except OSError:
+                self.close()
+                raise
+            start = max(time.monotonic(), self.busy_until)
+            self.busy_until = start + len(frames) / float(rate * channels * sample_width)
+        time.sleep(max(0.0, self.busy_until - time.monotonic()))
+
+    def _open(self, params):
+        self.close()
+        rate, channels, sample_width = params
+        command = [arg.format(format=self.formats[sample_width], rate=rate, channels=channels)
+                   for arg in self.template]
+        self.process = subprocess.Popen(command, stdin=subprocess.PIPE,
+                                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        self.params = params
+
+    def close(self):
+        """Close stdin; the player finishes what it already has and exits."""
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            self.process = None
+            self.params = None
+
+
+class AudioPlayer:
+    """Plays encoded audio from memory.
+
+    The backend for each format is detected once: decode in-process with
+    soundfile and play through sounddevice when available. Otherwise audio
+    that can be decoded here (WAV always, MP3 when soundfile can read it)
+    goes as raw PCM into one long-lived aplay/pacat process. Only MP3
+    without a decoder still starts a player per utterance, piping the bytes
+    into its stdin, and a temp file is written only when no player reads
+    stdin (macOS afplay and Windows need a path).
+    """
+
+    def __init__(self):
+        self.system = platform.system()
+        # One stream is shared by every format, so at most one player process stays open
+        self.stream = self._detect_stream()
+        self.backends = {fmt: self._detect_backend(fmt) for fmt in ("mp3", "wav")}
+        print(f"🔈 Audio playback: {', '.join(f'{fmt}={name}' for fmt, (name, _) in self.backends.items())}")
+
+    def _detect_backend(self, fmt):
+        try:
+            import sounddevice
+            import soundfile
+            if fmt.upper() in soundfile.available_formats():
+                return ("sounddevice", (sounddevice, soundfile))
+        except Exception:
+            pass
+
+        if self.stream and self._can_decode(fmt):
+            return ("stream", self.stream)
+
+        for command in PIPE_PLAYERS.get(fmt, []):
+            if shutil.which(command[0]):
+                return ("pipe", command)
+
+        return ("file", None)
+
+    def _detect_stream(self):
+        for template, formats in STREAM_PLAYERS:
+            if shutil.which(template[0]):
+                return PCMStream(template, formats)
+        return None
+
+    def _can_decode(self, fmt):
+        if fmt == "wav":
+            return True
+        try:
+            import soundfile
+            return fmt.upper() in soundfile.available_formats()
+        except Exception:
+            return False
+
+    def play(self, audio_bytes, fmt="mp3"):
+        """Play audio and return once playback has finished."""
+        if not audio_bytes:
+            return
+        name, handle = self.backends.get(fmt, ("file", None))
+        if name == "sounddevice":
+            self._play_in_process(audio_bytes, *handle)
+        elif name == "stream":
+            self._play_streamed(audio_bytes, fmt, handle)
+        elif name == "pipe":
+            subprocess.run(handle, input=audio_bytes, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        else:
+            self._play_from_file(audio_bytes, fmt)
+
+    def _play_in_process(self, audio_bytes, sounddevice, soundfile):
+        data, sample_rate = soundfile.read(io.BytesIO(audio_bytes), dtype="int16")
+        sounddevice.play(data, sample_rate)
+        sounddevice.wait()
+
+    def _play_streamed(self, audio_bytes, fmt, stream):
+        if fmt == "wav":
+            with wave.open(io.BytesIO(audio_bytes)) as w:
+                rate, channels, sample_width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+                frames = w.readframes(w.getnframes())
+        else:
+            import soundfile
+            data, rate = soundfile.read(io.BytesIO(audio_bytes), dtype="int16")
+            channels = 1 if data.ndim == 1 else data.shape[1]
+            sample_width = 2
+            frames = data.tobytes()
+        if not stream.supports(sample_width):
+            self._play_from_file(audio_bytes, fmt)
+            return
+        try:
+            stream.play(frames, rate, channels, sample_width)
+        except OSError as e:
+            # The player died; it is restarted on the next utterance
+            print(f"⚠️ Audio stream failed, playing from file instead: {e}")
+            self._play_from_file(audio_bytes, fmt)
+
+    def _play_from_file(self, audio_bytes, fmt):
+        """Last resort: write a temp file and hand it to the OS player"""
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f".{fmt}") as f:
+            f.write(audio_bytes)
+            temp_path = f.name
+        try:
+            if self.system == "Darwin":
+                subprocess.run(["afplay", temp_path])
+            elif self.system == "Windows":
+                os.startfile(temp_path)
+                # startfile returns immediately, so the player still needs the file
+                return
+            else:
+                for command in (["mpg123", "-q"], ["aplay", "-q"], ["paplay"]):
+                    if shutil.which(command[0]):
+                        subprocess.run(command + [temp_path])
+                        break
+        finally:
+            if self.system != "Windows":
+                try:
+                    os.remove(temp_path)
+                except OSError:
+                    pass
+
+
+_player = None
+
+
+def get_audio_player():
+    """Shared player, so backend detection only happens once per process."""
+    global _player
+    if _player is None:
+        _player = AudioPlayer()
+    return _player
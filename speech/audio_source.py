@@ -0,0 +1,41 @@
+# speech/audio_source.py
+import speech_recognition as sr
+
+
+class AudioSource:
+    """Where SpeechRecognizer gets its phrases from.
+
+    listen() returns one phrase as speech_recognition AudioData, or None
+    when the source has no more audio. AudioCapture is the microphone
+    implementation; WavReplaySource replays recordings for headless runs.
+    """
+
+    def __init__(self):
+        # Holds the energy threshold used when looking for speech in captured audio
+        self.recognizer = sr.Recognizer()
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        raise NotImplementedError
+
+
+class WavReplaySource(AudioSource):
+    """Feeds a scripted sequence of WAV files, one file per phrase."""
+
+    def __init__(self, wav_paths, loop=False):
+        super().__init__()
+        self.wav_paths = list(wav_paths)
+        self.loop = loop
+        self.position = 0
+        self._cache = {}
+
+    def listen(self, timeout=None, phrase_time_limit=None):
+        if self.position >= len(self.wav_paths):
+            if not self.loop or not self.wav_paths:
+                return None
+            self.position = 0
+        path = self.wav_paths[self.position]
+        self.position += 1
+        if path not in self._cache:
+            with sr.AudioFile(path) as source:
+                self._cache[path] = self.recognizer.record(source, duration=phrase_time_limit)
+        return self._cache[path]
@@ -0,0 +1,68 @@
+# speech/endpointer.py
+import audioop
+from config import VAD_AGGRESSIVENESS
+
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30
+VAD_FRAME_BYTES = VAD_SAMPLE_RATE * VAD_FRAME_MS // 1000 * 2
+
+
+class Endpointer:
+    """Decides whether each captured chunk contains speech.
+
+    Uses the WebRTC frame classifier when webrtcvad is installed, otherwise
+    an energy plus zero-crossing-rate rule: voiced speech is loud and has a
+    low crossing rate, while hiss and fans are quiet or cross zero a lot.
+    """
+
+    def __init__(self, sample_rate, sample_width, aggressiveness=VAD_AGGRESSIVENESS):
+        self.sample_rate = sample_rate
+        self.sample_width = sample_width
+        self.vad = webrtcvad.Vad(aggressiveness) if webrtcvad else None
+        self._resample_state = None
+        self._pending = b""
+        self._last_decision = False
+
+    def is_speech(self, buffer, energy_threshold, energy=None):
+        if self.vad is not None:
+            return self._webrtc_is_speech(buffer)
+        if energy is None:
+            energy = audioop.rms(buffer, self.sample_width)
+        if energy <= energy_threshold:
+            return False
+        if energy > 3 * energy_threshold:
+            return True
+        return self.zero_crossing_rate(buffer) < 0.25
+
+    def zero_crossing_rate(self, buffer):
+        samples = len(buffer) // self.sample_width
+        if samples < 2:
+            return 0.0
+        return audioop.cross(buffer, self.sample_width) / float(samples)
+
+    def _webrtc_is_speech(self, buffer):
+        data = buffer
+        if self.sample_width != 2:
+            data = audioop.lin2lin(data, self.sample_width, 2)
+        if self.sample_rate != VAD_SAMPLE_RATE:
+            data, self._resample_state = audioop.ratecv(
+                data, 2, 1, self.sample_rate, VAD_SAMPLE_RATE, self._resample_state
+            )
+        data = self._pending + data
+        voiced = 0
+        frames = 0
+        while len(data) >= VAD_FRAME_BYTES:
+            frame, data = data[:VAD_FRAME_BYTES], data[VAD_FRAME_BYTES:]
+            frames += 1
+            if self.vad.is_speech(frame, VAD_SAMPLE_RATE):
+                voiced += 1
+        self._pending = data
+        if frames:
+            # Chunks shorter than one VAD frame keep the previous decision
+            self._last_decision = voiced * 2 >= frames
+        return self._last_decision
@@ -0,0 +1,186 @@
+# speech/recognition_backends.py
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import speech_recognition as sr
+from config import RECOGNITION_BACKENDS, RECOGNITION_DEADLINE, RECOGNITION_MIN_CONFIDENCE, VOSK_MODEL_PATH
+from system.tracing import span, bind_turn
+
+
+class RecognitionBackend:
+    """Turns captured audio into text; returns None when nothing was understood."""
+    name = "base"
+    # Used when the engine doesn't report a confidence of its own
+    default_confidence = 1.0
+
+    def is_available(self):
+        return True
+
+    def recognize(self, audio, language="en-US"):
+        text, _ = self.transcribe(audio, language)
+        return text
+
+    def transcribe(self, audio, language="en-US"):
+        """Return (text, confidence), or (None, 0.0) when nothing was understood."""
+        text = self.recognize(audio, language)
+        return (text, self.default_confidence) if text else (None, 0.0)
+
+
+class GoogleBackend(RecognitionBackend):
+    name = "google"
+    default_confidence = 0.9
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def transcribe(self, audio, language="en-US"):
+        try:
+            result = self.recognizer.recognize_google(audio, language=language, show_all=True)
+        except (sr.UnknownValueError, sr.RequestError):
+            return None, 0.0
+        alternatives = result.get("alternative", []) if isinstance(result, dict) else []
+        if not alternatives:
+            return None, 0.0
+        best = alternatives[0]
+        return best["transcript"].lower(), best.get("confidence", self.default_confidence)
+
+
+class VoskBackend(RecognitionBackend):
+    """Offline recognition with a local Vosk model (VOSK_MODEL_PATH)."""
+    name = "vosk"
+
+    def __init__(self, model_path=VOSK_MODEL_PATH):
+        self.model_path = model_path
+        self._model = None
+
+    def is_available(self):
+        try:
+            import vosk
+        except ImportError:
+            return False
+        return os.path.isdir(self.model_path)
+
+    def transcribe(self, audio, language="en-US"):
+        import vosk
+        if self._model is None:
+            vosk.SetLogLevel(-1)
+            self._model = vosk.Model(self.model_path)
+        recognizer = vosk.KaldiRecognizer(self._model, 16000)
+        recognizer.SetWords(True)
+        recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=16000, convert_width=2))
+        result = json.loads(recognizer.FinalResult())
+        text = result.get("text", "").strip()
+        if not text:
+            return None, 0.0
+        words = result.get("result", [])
+        confidence = sum(w.get("conf", 0.0) for w in words) / len(words) if words else 0.5
+        return text.lower(), confidence
+
+
+class SphinxBackend(RecognitionBackend):
+    """Offline recognition with CMU PocketSphinx; less accurate, so it only wins when nothing else answers."""
+    name = "sphinx"
+    default_confidence = 0.5
+
+    def __init__(self):
+        self.recognizer = sr.Recognizer()
+
+    def is_available(self):
+        try:
+            import pocketsphinx
+            return True
+        except ImportError:
+            return False
+
+    def recognize(self, audio, language="en-US"):
+        try:
+            return self.recognizer.recognize_sphinx(audio).lower() or None
+        except (sr.UnknownValueError, sr.RequestError):
+            return None
+
+
+class RecognizerOrchestrator(RecognitionBackend):
+    """Sends the same audio to several backends at once.
+
+    The first result at or above min_confidence wins. Otherwise the most
+    confident result seen before the deadline is used, so one slow or
+    unreachable engine never stalls the assistant.
+    """
+    name = "race"
+
+    def __init__(self, backends, deadline=RECOGNITION_DEADLINE, min_confidence=RECOGNITION_MIN_CONFIDENCE):
+        self.backends = list(backends)
+        self.deadline = deadline
+        self.min_confidence = min_confidence
+        self.executor = ThreadPoolExecutor(max_workers=max(1, 2 * len(self.backends)),
+                                           thread_name_prefix="stt")
+
+    def transcribe(self, audio, language="en-US"):
+        pending = {self.executor.submit(bind_turn(self._transcribe_with), backend, audio, language): backend
+                   for backend in self.backends}
+        best_text, best_confidence = None, 0.0
+        end_time = time.monotonic() + self.deadline
+        while pending:
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                break
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                backend = pending.pop(future)
+                try:
+                    text, confidence = future.result()
+                except Exception as e:
+                    print(f"⚠️ {backend.name} recognition failed: {e}")
+                    continue
+                if not text:
+                    continue
+                if confidence >= self.min_confidence:
+                    return text, confidence
+                if confidence > best_confidence:
+                    best_text, best_confidence = text, confidence
+        # Stragglers keep running in the pool; their results are simply ignored
+        return best_text, best_confidence
+
+    def _transcribe_with(self, backend, audio, language):
+        with span("stt_engine", backend=backend.name) as attrs:
+            text, confidence = backend.transcribe(audio, language)
+            attrs["confidence"] = confidence
+            return text, confidence
+
+
+def build_recognition_backend(names=RECOGNITION_BACKENDS):
+    """Google alone, or a race between it and whichever offline engines are installed."""
+    factories = {"google": GoogleBackend, "vosk": VoskBackend, "sphinx": SphinxBackend}
+    backends = []
+    for name in names:
+        factory = factories.get(name.strip().lower())
+        if factory:
+            backend = factory()
+            if backend.is_available():
+                backends.append(backend)
+    if not backends:
+        return GoogleBackend()
+    if len(backends) == 1:
+        return backends[0]
+    print(f"🎧 Speech recognition racing: {', '.join(b.name for b in backends)}")
+    return RecognizerOrchestrator(backends)
+
+
+class ScriptedBackend(RecognitionBackend):
+    """Returns transcripts from a list in order, ignoring the audio; for replay runs and benchmarks."""
+    name = "scripted"
+
+    def __init__(self, transcripts, loop=False):
+        self.transcripts = list(transcripts)
+        self.loop = loop
+        self.position = 0
+
+    def recognize(self, audio, language="en-US"):
+        if self.position >= len(self.transcripts):
+            if not self.loop or not self.transcripts:
+                return None
+            self.position = 0
+        text = self.transcripts[self.position]
+        self.position += 1
+        return text.lower() if text else None
@@ -0,0 +1,161 @@
+# speech/speech_queue.py
+import contextlib
+import heapq
+import itertools
+import re
+import threading
+import time
+from concurrent.futures import Future
+from system.tracing import bind_turn
+
+PRIORITY_REMINDER = 0
+PRIORITY_NORMAL = 1
+# Announcements (e.g. the startup schedule) that play while Friday listens and pause during a conversation
+PRIORITY_BACKGROUND = 2
+
+# A period after these doesn't end a sentence
+ABBREVIATIONS = {"dr", "mr", "mrs", "ms", "prof", "st", "vs", "etc", "e.g", "i.e", "no", "approx"}
+
+
+class SpeechQueue:
+    """Single worker that owns the speaker.
+
+    Utterances are split into sentences and spoken one sentence at a time,
+    so a higher priority utterance (e.g. a reminder) queued while another
+    one is playing is spoken at the next sentence boundary. Background
+    utterances wait while a conversation holds them (hold_background).
+    """
+
+    def __init__(self, speak_func, pause_after=0.0):
+        self.speak_func = speak_func
+        self.pause_after = pause_after  # silence after each whole utterance, not each sentence
+        self._heap = []
+        self._pending = {}
+        self._counter = itertools.count()
+        self._condition = threading.Condition()
+        self._speaking = None  # priority of the sentence being spoken
+        self._holds = 0
+        self._worker = None
+
+    def submit(self, text, priority=PRIORITY_NORMAL, speak_func=None):
+        """Queue text for speaking and return a Future resolved once it was spoken."""
+        key = (priority, text)
+        with self._condition:
+            # Same text already waiting to be spoken - share its future
+            if key in self._pending:
+                return self._pending[key]
+
+            future = Future()
+            sentences = self.split_sentences(text)
+            if not sentences:
+                future.set_result(None)
+                return future
+
+            self._pending[key] = future
+            # Synthesis and playback spans run on the worker but belong to the caller's turn
+            speak_func = bind_turn(speak_func or self.speak_func)
+            item = (priority, next(self._counter), sentences, key, future, speak_func)
+            heapq.heappush(self._heap, item)
+            self._ensure_worker()
+            self._condition.notify()
+            return future
+
+    def wait_until_idle(self, timeout=None, include_background=True):
+        """Block until everything queued so far has been spoken.
+
+        Background speech is not waited for when include_background is False
+        or while it is held.
+        """
+        with self._condition:
+            return self._condition.wait_for(lambda: self._idle(include_background), timeout)
+
+    def is_idle(self, include_background=True):
+        with self._condition:
+            return self._idle(include_background)
+
+    @contextlib.contextmanager
+    def hold_background(self):
+        """Keep background speech quiet (after its current sentence) inside the block."""
+        with self._condition:
+            self._holds += 1
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._holds -= 1
+                self._condition.notify_all()
+
+    def _idle(self, include_background):
+        if self._speaking is not None:
+            # A background sentence already playing only counts when background speech is waited for
+            if self._speaking < PRIORITY_BACKGROUND or include_background:
+                return False
+        if not self._heap:
+            return True
+        # The heap top has the lowest priority number, so only background items are left
+        if self._heap[0][0] >= PRIORITY_BACKGROUND:
+            return not include_background or self._holds > 0
+        return False
+
+    def _ready(self):
+        return self._heap and not (self._holds and self._heap[0][0] >= PRIORITY_BACKGROUND)
+
+    def split_sentences(self, text):
+        """One sentence per line or after . ! ?, but not after "1." or abbreviations like "Dr." """
+        text = str(text).strip()
+        if not text:
+            return []
+        sentences = []
+        for line in text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            current = ""
+            for part in re.split(r'(?<=[.!?])\s+', line):
+                current = f"{current} {part}" if current else part
+                if not current:
+                    continue
+                last_word = current.rsplit(None, 1)[-1].lower()
+                if last_word.endswith(".") and (last_word[:-1].isdigit() or last_word[:-1] in ABBREVIATIONS):
+                    continue
+                sentences.append(current)
+                current = ""
+            if current:
+                sentences.append(current)
+        return sentences
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(target=self._run, daemon=True)
+            self._worker.start()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._ready():
+                    self._condition.wait()
+                priority, seq, sentences, key, future, speak_func = heapq.heappop(self._heap)
+                # Once started, the utterance can no longer be deduplicated
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+                self._speaking = priority
+
+            sentence, rest = sentences[0], sentences[1:]
+            try:
+                if future.running() or future.set_running_or_notify_cancel():
+                    speak_func(sentence)
+                    if rest:
+                        # Keep the original sequence so the utterance resumes before newer ones
+                        with self._condition:
+                            heapq.heappush(self._heap, (priority, seq, rest, None, future, speak_func))
+                    else:
+                        if self.pause_after:
+                            time.sleep(self.pause_after)
+                        future.set_result(None)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            finally:
+                with self._condition:
+                    self._speaking = None
+                    self._condition.notify_all()
@@ -1,31 +1,94 @@
 # speech/speech_recognition.py
+import audioop
+import re
 import speech_recognition as sr
+from .audio_capture import get_audio_capture
+from .recognition_backends import build_recognition_backend
+from .wake_word import KeywordSpotter, SAMPLE_RATE as SPOTTER_SAMPLE_RATE
+from system.tracing import span
 
 class SpeechRecognizer:
-    def __init__(self):
-        self.recognizer = sr.Recognizer()
+    def __init__(self, source=None, backend=None, spotter=None):
+        # Microphone by default; any AudioSource (e.g. WavReplaySource) works
+        self.source = source or get_audio_capture()
+        self.backend = backend or build_recognition_backend()
+        self.spotter = spotter or KeywordSpotter()
+        # Command spoken in the same breath as the wake word ("Friday, what's the time")
+        self.followup_audio = None
+        self.followup_text = None
     
     def listen_for_command(self):
-        with sr.Microphone() as source:
-            print("🎤 Listening for command...")
-            self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-            audio = self.recognizer.listen(source)
+        print("🎤 Listening for command...")
+        with span("listen"):
+            audio = self.source.listen()
+        if audio is None:
+            return None
+        return self.recognize_command(audio)
+
+    def recognize_command(self, audio):
         try:
-            return self.recognizer.recognize_google(audio, language="en-in").lower()
+            with span("stt", backend=self.backend.name):
+                text = self.backend.recognize(audio, language="en-in")
         except Exception as e:
-            print("⚠️ (speech recognition) could not understand audio.")
+            print(f"⚠️ (speech recognition) {self.backend.name} failed: {e}")
             return None
+        if not text:
+            print("⚠️ (speech recognition) could not understand audio.")
+        return text
     
     def listen_for_wake_word(self):
-        with sr.Microphone() as source:
-            self.recognizer.adjust_for_ambient_noise(source)
+        if self.spotter.is_ready():
+            print("🔊 Say 'Friday' to wake me up... (offline wake word)")
+        else:
             print("🔊 Say 'Friday' to wake me up...")
-            while True:
-                audio = self.recognizer.listen(source)
-                try:
-                    text = self.recognizer.recognize_google(audio).lower()
-                    if "friday" in text or "hey friday" in text:
-                        print("✅ Wake-word detected!")
-                        return True
-                except:
-                    continue
+        while True:
+            audio = self.source.listen()
+            if audio is None:
+                return False
+            self.followup_audio = None
+            self.followup_text = None
+            if self.spotter.is_ready():
+                # Matched locally - nothing leaves the machine until after the wake word
+                with span("wake_word_spot"):
+                    end_sample = self.spotter.spot_audio(audio)
+                if end_sample is not None:
+                    print("✅ Wake-word detected!")
+                    self.followup_audio = self._speech_after(audio, end_sample)
+                    return True
+                continue
+            try:
+                with span("stt", backend=self.backend.name, purpose="wake_word"):
+                    text = self.backend.recognize(audio)
+                if text and ("friday" in text or "hey friday" in text):
+                    print("✅ Wake-word detected!")
+                    command = re.sub(r'^[\s,.!?]+', '', text.split("friday", 1)[1])
+                    self.followup_text = command or None
+                    return True
+            except:
+                continue
+
+    def take_followup_command(self):
+        """Command that followed the wake word in the same utterance, or None."""
+        text, audio = self.followup_text, self.followup_audio
+        self.followup_text = self.followup_audio = None
+        if text:
+            return text
+        if audio is not None:
+            print("🎤 Recognizing command spoken with the wake word...")
+            return self.recognize_command(audio)
+        return None
+
+    def _speech_after(self, audio, end_sample, min_speech=0.3):
+        """Audio following the wake word, if it contains enough speech to be a command."""
+        width = audio.sample_width
+        start = int(end_sample * audio.sample_rate / SPOTTER_SAMPLE_RATE) * width
+        rest = audio.frame_data[start:]
+        chunk = int(audio.sample_rate * 0.02) * width
+        threshold = self.source.recognizer.energy_threshold
+        speech_chunks = sum(
+            1 for i in range(0, len(rest) - chunk + 1, chunk)
+            if audioop.rms(rest[i:i + chunk], width) > threshold
+        )
+        if speech_chunks * 0.02 < min_speech:
+            return None
+        return sr.AudioData(rest, audio.sample_rate, width)
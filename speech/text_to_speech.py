@@ -1,43 +1,126 @@
 # speech/text_to_speech.py
-import tempfile
-import os
-import platform
+import collections
+import contextlib
+import threading
 import time
-from gtts import gTTS
+from concurrent.futures import Future
+from config import TTS_CACHE_SIZE
+from .audio_player import get_audio_player
+from .tts_backends import GTTSBackend, EspeakBackend, BackendSelector
+from .speech_queue import SpeechQueue, PRIORITY_NORMAL, PRIORITY_REMINDER, PRIORITY_BACKGROUND
+from system.tracing import span
 
 class TextToSpeech:
-    def __init__(self):
-        pass
-    
-    def speak(self, text):
-        """Speak with gTTS and also print to console."""
+    # One queue for the whole process so speech from different threads never overlaps
+    _queue = None
+
+    def __init__(self, selector=None):
+        self.player = get_audio_player()
+        self.selector = selector or BackendSelector(GTTSBackend(), EspeakBackend())
+        if TextToSpeech._queue is None:
+            TextToSpeech._queue = SpeechQueue(self._speak_now, pause_after=0.2)
+        self.queue = TextToSpeech._queue
+        # Synthesized audio of recent sentences, keyed by (backend name, sentence)
+        self._cache = collections.OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def speak(self, text, priority=PRIORITY_NORMAL):
+        """Queue text for speaking and return a Future; call .result() to wait for it."""
+        return self.queue.submit(text, priority, self._speak_now)
+
+    def speak_reminder(self, text):
+        return self.speak(text, priority=PRIORITY_REMINDER)
+
+    def speak_background(self, text):
+        """Speak without blocking listening; pauses while a conversation holds background speech."""
+        return self.speak(text, priority=PRIORITY_BACKGROUND)
+
+    def wait_until_idle(self, timeout=None, include_background=True):
+        """Wait until all queued speech has been played (e.g. before listening)."""
+        return self.queue.wait_until_idle(timeout, include_background)
+
+    def hold_background(self):
+        return self.queue.hold_background()
+
+    def warm(self, texts):
+        """Synthesize phrases ahead of time so their first use plays from the cache."""
+        for text in texts:
+            for sentence in self.queue.split_sentences(text):
+                backend = self.selector.choose(sentence)
+                self._synthesize(backend, sentence)
+
+    def _speak_now(self, text):
+        """Synthesize with the selected backend and also print to console."""
         print("🤖 Friday says:", text)
+        backend = self.selector.choose(text)
+        audio = self._synthesize(backend, text)
+        if audio is None:
+            backend = self.selector.fallback_for(backend)
+            audio = self._synthesize(backend, text) if backend else None
+        if not audio:
+            return
         try:
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".mp3") as f:
-                temp_path = f.name
-            tts = gTTS(text=text, lang='en', slow=False)
-            tts.save(temp_path)
-            self._play_audio(temp_path)
-            time.sleep(0.2)
+            with span("tts_playback", backend=backend.name):
+                self.player.play(audio, backend.audio_format)
         except Exception as e:
             print(f"❌ Error playing TTS: {e}")
-        finally:
-            self._cleanup_temp_file(temp_path)
-    
-    def _play_audio(self, file_path):
-        """Play audio file based on OS"""
-        system = platform.system()
-        if system == "Linux":
-            os.system(f"mpg123 -q {file_path} || aplay {file_path} || paplay {file_path}")
-        elif system == "Darwin":
-            os.system(f"afplay {file_path}")
-        elif system == "Windows":
-            os.startfile(file_path)
-    
-    def _cleanup_temp_file(self, file_path):
-        """Clean up temporary audio file"""
+
+    def _synthesize(self, backend, text):
+        key = (backend.name, text)
+        with self._cache_lock:
+            if key in self._cache:
+                self._cache.move_to_end(key)
+                return self._cache[key]
+        start = time.monotonic()
         try:
-            if file_path and os.path.exists(file_path):
-                os.remove(file_path)
-        except:
-            pass
+            with span("tts_synthesize", backend=backend.name, words=len(text.split())):
+                audio = backend.synthesize(text)
+            self.selector.record(backend, time.monotonic() - start)
+            if audio:
+                with self._cache_lock:
+                    self._cache[key] = audio
+                    while len(self._cache) > TTS_CACHE_SIZE:
+                        self._cache.popitem(last=False)
+            return audio
+        except Exception as e:
+            self.selector.record(backend, time.monotonic() - start, ok=False)
+            print(f"❌ Error synthesizing TTS with {backend.name}: {e}")
+            return None
+
+
+class CapturingTextToSpeech(TextToSpeech):
+    """Records what would have been spoken instead of playing it (headless/batch mode).
+
+    Each thread gets its own transcript, so parallel workers don't mix output.
+    """
+
+    def __init__(self, echo=False):
+        self.echo = echo
+        self._local = threading.local()
+
+    def speak(self, text, priority=PRIORITY_NORMAL):
+        if self.echo:
+            print("🤖 Friday says:", text)
+        self.spoken().append(str(text))
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def wait_until_idle(self, timeout=None, include_background=True):
+        return True
+
+    def hold_background(self):
+        return contextlib.nullcontext()
+
+    def warm(self, texts):
+        pass
+
+    def spoken(self):
+        if not hasattr(self._local, "lines"):
+            self._local.lines = []
+        return self._local.lines
+
+    def take_spoken(self):
+        lines = self.spoken()
+        self._local.lines = []
+        return lines
@@ -0,0 +1,116 @@
+# speech/tts_backends.py
+import io
+import shutil
+import subprocess
+import time
+from config import TTS_BACKEND, TTS_SHORT_TEXT_WORDS, TTS_LATENCY_BUDGET, TTS_FAILURE_COOLDOWN
+
+
+class TTSBackend:
+    """Turns text into encoded audio bytes that AudioPlayer can play."""
+    name = "base"
+    audio_format = "mp3"
+    is_local = False
+
+    def is_available(self):
+        return True
+
+    def synthesize(self, text):
+        raise NotImplementedError
+
+
+class GTTSBackend(TTSBackend):
+    name = "gtts"
+    audio_format = "mp3"
+
+    def synthesize(self, text):
+        from gtts import gTTS
+        buffer = io.BytesIO()
+        gTTS(text=text, lang='en', slow=False).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """Offline synthesis with espeak-ng (or classic espeak), WAV written to stdout."""
+    name = "espeak"
+    audio_format = "wav"
+    is_local = True
+
+    def __init__(self, words_per_minute=165):
+        self.command = shutil.which("espeak-ng") or shutil.which("espeak")
+        self.words_per_minute = words_per_minute
+
+    def is_available(self):
+        return self.command is not None
+
+    def synthesize(self, text):
+        result = subprocess.run(
+            [self.command, "--stdout", "-s", str(self.words_per_minute), text],
+            capture_output=True, timeout=10
+        )
+        if result.returncode != 0 or not result.stdout:
+            raise RuntimeError(f"{self.command} failed: {result.stderr.decode(errors='ignore').strip()}")
+        return result.stdout
+
+
+class SilentBackend(TTSBackend):
+    """Produces no audio; for headless runs and benchmarks."""
+    name = "silent"
+    is_local = True
+
+    def synthesize(self, text):
+        return b""
+
+
+class BackendSelector:
+    """Chooses a backend per utterance.
+
+    Short confirmations go to the local synthesizer. Longer text goes to
+    gTTS unless it has failed recently (network down) or its measured
+    latency is over budget; in that case gTTS is re-probed now and then so
+    it can win back once the network recovers.
+    """
+
+    def __init__(self, remote, local=None, mode=TTS_BACKEND, short_text_words=TTS_SHORT_TEXT_WORDS,
+                 latency_budget=TTS_LATENCY_BUDGET, failure_cooldown=TTS_FAILURE_COOLDOWN):
+        self.remote = remote
+        self.local = local if local and local.is_available() else None
+        self.mode = mode
+        self.short_text_words = short_text_words
+        self.latency_budget = latency_budget
+        self.failure_cooldown = failure_cooldown
+        self.latency = {}
+        self.last_failure = {}
+        self.last_attempt = {}
+
+    def choose(self, text):
+        if not self.local or self.mode == "gtts":
+            return self.remote
+        if self.mode == "local":
+            return self.local
+
+        now = time.monotonic()
+        if now - self.last_failure.get(self.remote.name, float("-inf")) < self.failure_cooldown:
+            return self.local
+        if len(text.split()) <= self.short_text_words:
+            return self.local
+        if self.latency.get(self.remote.name, 0.0) > self.latency_budget:
+            # Probe the remote backend again once in a while
+            if now - self.last_attempt.get(self.remote.name, float("-inf")) < self.failure_cooldown:
+                return self.local
+        return self.remote
+
+    def fallback_for(self, backend):
+        if backend is self.remote:
+            return self.local
+        return self.remote
+
+    def record(self, backend, elapsed, ok=True):
+        now = time.monotonic()
+        self.last_attempt[backend.name] = now
+        if not ok:
+            self.last_failure[backend.name] = now
+            return
+        previous = self.latency.get(backend.name)
+        # Exponentially weighted moving average of synthesis time
+        self.latency[backend.name] = elapsed if previous is None else 0.7 * previous + 0.3 * elapsed
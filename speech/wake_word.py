@@ -0,0 +1,227 @@
+# speech/wake_word.py
+import glob
+import os
+import wave
+from config import WAKE_WORD_TEMPLATE_DIR, WAKE_WORD_THRESHOLD
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+SAMPLE_RATE = 16000
+FRAME_LENGTH = 400      # 25 ms
+FRAME_STEP = 160        # 10 ms
+NUM_FFT = 512
+NUM_FILTERS = 26
+NUM_CEPSTRA = 13
+DEFAULT_THRESHOLD = 12.0
+
+
+class KeywordSpotter:
+    """Offline wake-word detector.
+
+    Each recorded template of the wake word (a short WAV in the template
+    directory) is turned into MFCC features. An utterance is trimmed to
+    its speech onset with a simple energy VAD and matched against every
+    template with open-ended DTW, which also tells where the keyword ends.
+    """
+
+    def __init__(self, template_dir=WAKE_WORD_TEMPLATE_DIR, threshold=WAKE_WORD_THRESHOLD):
+        self.template_dir = template_dir
+        self.threshold = threshold
+        self.templates = []
+        if np is None:
+            return
+        self._filterbank = self._mel_filterbank()
+        self._dct = self._dct_matrix()
+        for path in sorted(glob.glob(os.path.join(template_dir, "*.wav"))):
+            try:
+                self.add_template(read_wav_samples(path))
+            except Exception as e:
+                print(f"❌ Could not load wake-word template {path}: {e}")
+        if self.templates and self.threshold is None:
+            self.threshold = self._threshold_from_templates()
+
+    def is_ready(self):
+        return np is not None and bool(self.templates)
+
+    def add_template(self, samples):
+        onset = self._speech_onset(samples)
+        end = self._speech_end(samples)
+        features = self.mfcc(samples[onset:end])
+        if len(features) < 10:
+            raise ValueError("template is too short")
+        self.templates.append(features)
+
+    def spot(self, samples):
+        """Return the sample index where the wake word ends, or None if it wasn't said."""
+        if not self.is_ready() or len(samples) < FRAME_LENGTH:
+            return None
+        onset = self._speech_onset(samples)
+        longest = max(len(t) for t in self.templates)
+        window = samples[onset:onset + (2 * longest + 2) * FRAME_STEP + FRAME_LENGTH]
+        features = self.mfcc(window)
+
+        best_cost, best_end = None, None
+        for template in self.templates:
+            cost, end_frame = self._open_end_dtw(template, features)
+            if cost is not None and (best_cost is None or cost < best_cost):
+                best_cost, best_end = cost, end_frame
+        if best_cost is None or best_cost > self.threshold:
+            return None
+        return onset + (best_end + 1) * FRAME_STEP + (FRAME_LENGTH - FRAME_STEP)
+
+    def spot_audio(self, audio):
+        """spot() for a speech_recognition AudioData"""
+        raw = audio.get_raw_data(convert_rate=SAMPLE_RATE, convert_width=2)
+        return self.spot(np.frombuffer(raw, dtype=np.int16).astype(np.float64))
+
+    def spot_wav(self, path):
+        """spot() for a recorded WAV file, handy for checking fixtures"""
+        return self.spot(read_wav_samples(path))
+
+    def mfcc(self, samples):
+        signal = np.append(samples[:1], samples[1:] - 0.97 * samples[:-1])
+        if len(signal) < FRAME_LENGTH:
+            return np.zeros((0, NUM_CEPSTRA - 1))
+        frame_count = 1 + (len(signal) - FRAME_LENGTH) // FRAME_STEP
+        indices = np.arange(FRAME_LENGTH)[None, :] + FRAME_STEP * np.arange(frame_count)[:, None]
+        frames = signal[indices] * np.hamming(FRAME_LENGTH)
+        power = np.abs(np.fft.rfft(frames, NUM_FFT)) ** 2 / NUM_FFT
+        energies = np.log(np.maximum(power @ self._filterbank.T, 1e-10))
+        cepstra = energies @ self._dct.T
+        # Drop c0 so matching ignores loudness
+        cepstra = cepstra[:, 1:]
+        return cepstra
+
+    def _open_end_dtw(self, template, features):
+        n, m = len(template), len(features)
+        if m < n // 2:
+            return None, None
+        cost = np.sqrt(((template[:, None, :] - features[None, :, :]) ** 2).sum(axis=2))
+        acc = np.full((n, m), np.inf)
+        acc[0] = np.cumsum(cost[0])
+        for i in range(1, n):
+            previous = acc[i - 1]
+            acc[i, 0] = previous[0] + cost[i, 0]
+            diagonal = (np.minimum(previous[1:], previous[:-1]) + cost[i, 1:]).tolist()
+            step = cost[i].tolist()
+            left = acc[i, 0]
+            values = [left]
+            for j in range(1, m):
+                left = min(diagonal[j - 1], left + step[j])
+                values.append(left)
+            acc[i] = values
+        # The keyword may end anywhere between half and twice the template length
+        first, last = n // 2, min(m, 2 * n)
+        normalized = acc[n - 1, first:last] / (n + np.arange(first, last) + 1)
+        best = int(np.argmin(normalized))
+        return float(normalized[best]), first + best
+
+    def _threshold_from_templates(self):
+        if len(self.templates) < 2:
+            return DEFAULT_THRESHOLD
+        distances = []
+        for i, template in enumerate(self.templates):
+            for j, other in enumerate(self.templates):
+                if i != j:
+                    cost, _ = self._open_end_dtw(template, other)
+                    if cost is not None:
+                        distances.append(cost)
+        return max(distances) * 1.2 if distances else DEFAULT_THRESHOLD
+
+    def _frame_energies(self, samples):
+        count = len(samples) // FRAME_STEP
+        if count == 0:
+            return np.zeros(0)
+        frames = samples[:count * FRAME_STEP].reshape(count, FRAME_STEP)
+        return np.sqrt((frames ** 2).mean(axis=1))
+
+    def _speech_frames(self, samples):
+        energies = self._frame_energies(samples)
+        if not len(energies):
+            return energies
+        floor = np.percentile(energies, 10)
+        return energies > max(floor * 3, energies.max() * 0.1)
+
+    def _speech_onset(self, samples):
+        speech = self._speech_frames(samples)
+        hits = np.flatnonzero(speech)
+        return max(0, int(hits[0]) - 2) * FRAME_STEP if len(hits) else 0
+
+    def _speech_end(self, samples):
+        speech = self._speech_frames(samples)
+        hits = np.flatnonzero(speech)
+        return min(len(samples), (int(hits[-1]) + 3) * FRAME_STEP) if len(hits) else len(samples)
+
+    def _mel_filterbank(self):
+        def to_mel(hz):
+            return 2595 * np.log10(1 + hz / 700.0)
+
+        def to_hz(mel):
+            return 700 * (10 ** (mel / 2595.0) - 1)
+
+        mel_points = np.linspace(to_mel(0), to_mel(SAMPLE_RATE / 2), NUM_FILTERS + 2)
+        bins = np.floor((NUM_FFT + 1) * to_hz(mel_points) / SAMPLE_RATE).astype(int)
+        filterbank = np.zeros((NUM_FILTERS, NUM_FFT // 2 + 1))
+        for i in range(1, NUM_FILTERS + 1):
+            left, centre, right = bins[i - 1], bins[i], bins[i + 1]
+            for k in range(left, centre):
+                filterbank[i - 1, k] = (k - left) / max(1, centre - left)
+            for k in range(centre, right):
+                filterbank[i - 1, k] = (right - k) / max(1, right - centre)
+        return filterbank
+
+    def _dct_matrix(self):
+        n = np.arange(NUM_FILTERS)
+        k = np.arange(NUM_CEPSTRA)[:, None]
+        return np.cos(np.pi * k * (2 * n + 1) / (2 * NUM_FILTERS))
+
+
+def read_wav_samples(path):
+    """Read a 16-bit WAV file as mono float samples at 16 kHz."""
+    import audioop
+    with wave.open(path, "rb") as wav:
+        width = wav.getsampwidth()
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        data = wav.readframes(wav.getnframes())
+    if channels > 1:
+        data = audioop.tomono(data, width, 0.5, 0.5)
+    if width != 2:
+        data = audioop.lin2lin(data, width, 2)
+    if rate != SAMPLE_RATE:
+        data, _ = audioop.ratecv(data, 2, 1, rate, SAMPLE_RATE, None)
+    return np.frombuffer(data, dtype=np.int16).astype(np.float64)
+
+
+def record_templates(count=3, template_dir=WAKE_WORD_TEMPLATE_DIR):
+    """Record a few examples of the wake word from the shared microphone."""
+    from .audio_capture import get_audio_capture
+    os.makedirs(template_dir, exist_ok=True)
+    capture = get_audio_capture()
+    for i in range(count):
+        print(f"🎤 Say 'Friday' ({i + 1}/{count})...")
+        audio = capture.listen(timeout=10, phrase_time_limit=3)
+        if audio is None:
+            break
+        path = os.path.join(template_dir, f"friday_{i + 1}.wav")
+        with open(path, "wb") as f:
+            f.write(audio.get_wav_data(convert_rate=SAMPLE_RATE, convert_width=2))
+        print(f"✅ Saved {path}")
+
+
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) > 1 and sys.argv[1] == "record":
+        record_templates()
+    else:
+        spotter = KeywordSpotter()
+        if not spotter.is_ready():
+            print("No wake-word templates found. Run: python -m speech.wake_word record")
+            sys.exit(1)
+        print(f"Threshold: {spotter.threshold:.2f}")
+        for wav_path in sys.argv[1:]:
+            end = spotter.spot_wav(wav_path)
+            print(f"{wav_path}: {'wake word ends at %.2fs' % (end / SAMPLE_RATE) if end is not None else 'no wake word'}")
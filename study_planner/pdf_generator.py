@@ -1,187 +1,286 @@
 # study_planner/pdf_generator.py
 import datetime
-from reportlab.lib.pagesizes import letter
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.lib import colors
-from reportlab.lib.units import inch
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from config import STUDY_START_TIME
+from system.tracing import traced
+
+
+class LazyStory(list):
+    """A story list that refills itself from a generator of flowable chunks.
+
+    reportlab's build() consumes the story from the front while checking
+    len(), so only a few days' tables exist at a time instead of the whole
+    plan.
+    """
+
+    def __init__(self, chunks, low_water=4):
+        super().__init__()
+        self.chunks = iter(chunks)
+        self.low_water = low_water
+        self._refill()
+
+    def _refill(self):
+        while self.chunks is not None and super().__len__() < self.low_water:
+            chunk = next(self.chunks, None)
+            if chunk is None:
+                self.chunks = None
+            else:
+                self.extend(chunk)
+
+    def __len__(self):
+        self._refill()
+        return super().__len__()
+
 
 class PDFGenerator:
+    # ParagraphStyles, TableStyles and the stylesheet are built once and shared by every render
+    _styles = None
+    _styles_lock = threading.Lock()
+
     def __init__(self):
-        pass
-    
-    def create_study_pdf(self, study_plan, filename="study_plan.pdf"):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf")
+        self._lock = threading.Lock()
+        self._queued = {}  # filename -> latest plan waiting to be rendered
+        self._rendered = {}  # filename -> (plan fingerprint, file mtime) of the last render
+
+    def render_in_background(self, study_plan, filename="study_plan.pdf"):
+        """Queue a render; if several are queued for one file only the latest is drawn."""
+        snapshot = json.loads(json.dumps(study_plan))  # the caller may keep changing its plan
+        with self._lock:
+            already_queued = filename in self._queued
+            self._queued[filename] = snapshot
+        if not already_queued:
+            self._executor.submit(self._render_queued, filename)
+
+    def _render_queued(self, filename):
+        with self._lock:
+            study_plan = self._queued.pop(filename, None)
+        if study_plan is not None:
+            self.create_study_pdf(study_plan, filename)
+
+    def _fingerprint(self, study_plan):
+        content = json.dumps(study_plan, sort_keys=True) + datetime.date.today().isoformat()
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def _file_mtime(self, filename):
         try:
-            doc = SimpleDocTemplate(filename, pagesize=letter)
-            styles = getSampleStyleSheet()
-            story = []
-            
-            # Title
-            title_style = ParagraphStyle(
+            return os.stat(filename).st_mtime_ns
+        except OSError:
+            return None
+
+    def create_study_pdf(self, study_plan, filename="study_plan.pdf"):
+        fingerprint = self._fingerprint(study_plan)
+        if self._rendered.get(filename) == (fingerprint, self._file_mtime(filename)):
+            print(f"✅ PDF already up to date: {filename}")
+            return filename
+        if self._render(study_plan, filename):
+            self._rendered[filename] = (fingerprint, self._file_mtime(filename))
+            return filename
+        return None
+
+    @classmethod
+    def _get_styles(cls):
+        with cls._styles_lock:
+            if cls._styles is None:
+                cls._styles = cls._build_styles()
+            return cls._styles
+
+    @staticmethod
+    def _build_styles():
+        # reportlab is heavy; only import it when a PDF is actually made
+        from reportlab.platypus import TableStyle
+        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from reportlab.lib import colors
+
+        styles = getSampleStyleSheet()
+        return {
+            'normal': styles['Normal'],
+            'heading2': styles['Heading2'],
+            'title': ParagraphStyle(
                 'CustomTitle',
                 parent=styles['Heading1'],
                 fontSize=18,
                 spaceAfter=30,
                 alignment=1
-            )
-            story.append(Paragraph("Smart Study Plan", title_style))
-            story.append(Spacer(1, 20))
-            
-            # Summary
-            summary_style = ParagraphStyle(
+            ),
+            'summary': ParagraphStyle(
                 'Summary',
                 parent=styles['Normal'],
                 fontSize=12,
                 spaceAfter=12
-            )
-            
-            total_days = len(study_plan.get('daily_schedule', {}))
-            total_subjects = len(study_plan.get('subjects', []))
-            hours_per_day = study_plan.get('available_hours_per_day', 4)
-            
-            summary_text = f"""
-            <b>Study Plan Summary:</b><br/>
-            • Total Subjects: {total_subjects}<br/>
-            • Study Period: {total_days} days<br/>
-            • Daily Study Hours: {hours_per_day}<br/>
-            • Created on: {datetime.date.today().strftime('%B %d, %Y')}
-            """
-            story.append(Paragraph(summary_text, summary_style))
-            story.append(Spacer(1, 20))
-            
-            # Subjects Overview
-            if study_plan.get('subjects'):
-                story.append(Paragraph("<b>Subjects Overview:</b>", styles['Heading2']))
-                subject_data = [['Subject', 'Exam Date', 'Days Left', 'Priority']]
-                for subject in study_plan['subjects']:
-                    try:
-                        exam_date = datetime.datetime.strptime(subject['exam_date'], "%Y-%m-%d")
-                        formatted_date = exam_date.strftime("%d %B %Y")
-                    except:
-                        formatted_date = subject.get('exam_date', 'Unknown')
-                    
-                    days_left = subject.get('days_until_exam', 'Unknown')
-                    if isinstance(days_left, int):
-                        days_left = str(days_left)
-                    
-                    priority_rank = subject.get('priority_rank', 'N/A')
-                    
-                    subject_data.append([
-                        Paragraph(subject.get('name', 'Unknown'), styles['Normal']),
-                        Paragraph(formatted_date, styles['Normal']),
-                        Paragraph(days_left, styles['Normal']),
-                        Paragraph(f"#{priority_rank}", styles['Normal'])
-                    ])
-                
-                subject_table = Table(subject_data, colWidths=[2*inch, 1.5*inch, 1.2*inch, 0.8*inch])
-                subject_table.setStyle(TableStyle([
-                    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-                    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                    ('FONTSIZE', (0, 0), (-1, 0), 12),
-                    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-                    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-                    ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                    ('WORDWRAP', (0, 0), (-1, -1), True),
-                ]))
-                story.append(subject_table)
-                story.append(Spacer(1, 30))
-            
-            # Daily Schedule
-            if study_plan.get('daily_schedule'):
-                story.append(Paragraph("<b>Daily Study Schedule:</b>", styles['Heading2']))
-                
-                for date, schedule in list(study_plan['daily_schedule'].items())[:7]:
-                    story.append(Spacer(1, 15))
-                    
-                    try:
-                        schedule_date = datetime.datetime.strptime(date, "%Y-%m-%d")
-                        formatted_date = schedule_date.strftime("%A, %d %B %Y")
-                    except:
-                        formatted_date = date
-                    
-                    date_style = ParagraphStyle(
-                        'DateHeader',
-                        parent=styles['Heading3'],
-                        fontSize=12,
-                        textColor=colors.darkblue,
-                        spaceAfter=8
-                    )
-                    story.append(Paragraph(f"{formatted_date}", date_style))
-                    
-                    if not schedule:
-                        story.append(Paragraph("No study sessions scheduled", styles['Normal']))
-                        story.append(Spacer(1, 15))
-                        continue
-                        
-                    session_data = [[
-                        Paragraph('<b>Time</b>', styles['Normal']),
-                        Paragraph('<b>Subject</b>', styles['Normal']),
-                        Paragraph('<b>Hours</b>', styles['Normal']),
-                        Paragraph('<b>Topics</b>', styles['Normal'])
-                    ]]
-                    
-                    current_time = datetime.datetime.strptime("09:00", "%H:%M")
-                    for session in schedule:
-                        end_time = current_time + datetime.timedelta(hours=session.get('hours', 1))
-                        time_slot = f"{current_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
-                        
-                        topics = session.get('topics', [])
-                        if isinstance(topics, list):
-                            topics_text = ", ".join(topics) if topics else "General Study"
-                        else:
-                            topics_text = str(topics)
-                        
-                        session_data.append([
-                            Paragraph(time_slot, styles['Normal']),
-                            Paragraph(session.get('subject', 'Unknown'), styles['Normal']),
-                            Paragraph(f"{session.get('hours', 1)}h", styles['Normal']),
-                            Paragraph(topics_text, styles['Normal'])
-                        ])
-                        
-                        current_time = end_time + datetime.timedelta(minutes=15)
-                    
-                    daily_table = Table(session_data, colWidths=[1.8*inch, 1.5*inch, 0.7*inch, 3*inch])
-                    daily_table.setStyle(TableStyle([
-                        ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
-                        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                        ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-                        ('GRID', (0, 0), (-1, -1), 1, colors.black),
-                        ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                        ('FONTSIZE', (0, 0), (-1, -1), 9),
-                        ('WORDWRAP', (0, 0), (-1, -1), True),
-                        ('LEFTPADDING', (0, 0), (-1, -1), 6),
-                        ('RIGHTPADDING', (0, 0), (-1, -1), 6),
-                        ('TOPPADDING', (0, 0), (-1, -1), 8),
-                        ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                    ]))
-                    
-                    story.append(daily_table)
-                    story.append(Spacer(1, 20))
-            
-            # Tips section
-            story.append(Spacer(1, 20))
-            story.append(Paragraph("<b>Study Tips:</b>", styles['Heading2']))
-            tips = [
-                "• Take regular breaks every 45-60 minutes",
-                "• Review previous day's topics before starting new ones", 
-                "• Stay hydrated and maintain a healthy diet",
-                "• Get adequate sleep for better retention",
-                "• Use active recall and spaced repetition techniques"
-            ]
-            
-            for tip in tips:
-                story.append(Paragraph(tip, styles['Normal']))
-                story.append(Spacer(1, 5))
-            
-            doc.build(story)
+            ),
+            'date': ParagraphStyle(
+                'DateHeader',
+                parent=styles['Heading3'],
+                fontSize=12,
+                textColor=colors.darkblue,
+                spaceAfter=8
+            ),
+            'subject_table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+                ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, 0), 12),
+                ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+                ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('WORDWRAP', (0, 0), (-1, -1), True),
+            ]),
+            'daily_table': TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightblue),
+                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+                ('GRID', (0, 0), (-1, -1), 1, colors.black),
+                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+                ('FONTSIZE', (0, 0), (-1, -1), 9),
+                ('WORDWRAP', (0, 0), (-1, -1), True),
+                ('LEFTPADDING', (0, 0), (-1, -1), 6),
+                ('RIGHTPADDING', (0, 0), (-1, -1), 6),
+                ('TOPPADDING', (0, 0), (-1, -1), 8),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+            ]),
+        }
+
+    @traced("pdf")
+    def _render(self, study_plan, filename):
+        from reportlab.lib.pagesizes import letter
+        from reportlab.platypus import SimpleDocTemplate
+        try:
+            doc = SimpleDocTemplate(filename, pagesize=letter)
+            doc.build(LazyStory(self._story_chunks(study_plan, self._get_styles())))
             print(f"✅ PDF created successfully: {filename}")
-            return filename
-            
+            return True
+
         except Exception as e:
             print(f"❌ PDF creation error: {e}")
             import traceback
             traceback.print_exc()
-            return None
+            return False
+
+    def _story_chunks(self, study_plan, styles):
+        """The story as a sequence of small lists: header, subjects, one per day, tips."""
+        from reportlab.platypus import Paragraph, Spacer, Table
+        from reportlab.lib.units import inch
+
+        # Title
+        yield [Paragraph("Smart Study Plan", styles['title']), Spacer(1, 20)]
+
+        # Summary
+        total_days = len(study_plan.get('daily_schedule', {}))
+        total_subjects = len(study_plan.get('subjects', []))
+        hours_per_day = study_plan.get('available_hours_per_day', 4)
+
+        summary_text = f"""
+        <b>Study Plan Summary:</b><br/>
+        • Total Subjects: {total_subjects}<br/>
+        • Study Period: {total_days} days<br/>
+        • Daily Study Hours: {hours_per_day}<br/>
+        • Created on: {datetime.date.today().strftime('%B %d, %Y')}
+        """
+        yield [Paragraph(summary_text, styles['summary']), Spacer(1, 20)]
+
+        # Subjects Overview
+        if study_plan.get('subjects'):
+            subject_data = [['Subject', 'Exam Date', 'Days Left', 'Priority']]
+            for subject in study_plan['subjects']:
+                try:
+                    exam_date = datetime.datetime.strptime(subject['exam_date'], "%Y-%m-%d")
+                    formatted_date = exam_date.strftime("%d %B %Y")
+                except:
+                    formatted_date = subject.get('exam_date', 'Unknown')
+
+                days_left = subject.get('days_until_exam', 'Unknown')
+                if isinstance(days_left, int):
+                    days_left = str(days_left)
+
+                priority_rank = subject.get('priority_rank', 'N/A')
+
+                subject_data.append([
+                    Paragraph(subject.get('name', 'Unknown'), styles['normal']),
+                    Paragraph(formatted_date, styles['normal']),
+                    Paragraph(days_left, styles['normal']),
+                    Paragraph(f"#{priority_rank}", styles['normal'])
+                ])
+
+            subject_table = Table(subject_data, colWidths=[2*inch, 1.5*inch, 1.2*inch, 0.8*inch])
+            subject_table.setStyle(styles['subject_table'])
+            yield [Paragraph("<b>Subjects Overview:</b>", styles['heading2']), subject_table, Spacer(1, 30)]
+
+        # Daily Schedule, every day of the plan
+        if study_plan.get('daily_schedule'):
+            yield [Paragraph("<b>Daily Study Schedule:</b>", styles['heading2'])]
+
+            for date, schedule in study_plan['daily_schedule'].items():
+                yield self._day_flowables(date, schedule, styles)
+
+        # Tips section
+        tips = [
+            "• Take regular breaks every 45-60 minutes",
+            "• Review previous day's topics before starting new ones",
+            "• Stay hydrated and maintain a healthy diet",
+            "• Get adequate sleep for better retention",
+            "• Use active recall and spaced repetition techniques"
+        ]
+        chunk = [Spacer(1, 20), Paragraph("<b>Study Tips:</b>", styles['heading2'])]
+        for tip in tips:
+            chunk.append(Paragraph(tip, styles['normal']))
+            chunk.append(Spacer(1, 5))
+        yield chunk
+
+    def _day_flowables(self, date, schedule, styles):
+        from reportlab.platypus import Paragraph, Spacer, Table
+        from reportlab.lib.units import inch
+
+        try:
+            schedule_date = datetime.datetime.strptime(date, "%Y-%m-%d")
+            formatted_date = schedule_date.strftime("%A, %d %B %Y")
+        except:
+            formatted_date = date
+
+        flowables = [Spacer(1, 15), Paragraph(f"{formatted_date}", styles['date'])]
+
+        if not schedule:
+            flowables.append(Paragraph("No study sessions scheduled", styles['normal']))
+            flowables.append(Spacer(1, 15))
+            return flowables
+
+        session_data = [[
+            Paragraph('<b>Time</b>', styles['normal']),
+            Paragraph('<b>Subject</b>', styles['normal']),
+            Paragraph('<b>Hours</b>', styles['normal']),
+            Paragraph('<b>Topics</b>', styles['normal'])
+        ]]
+
+        current_time = datetime.datetime.strptime(STUDY_START_TIME, "%H:%M")
+        for session in schedule:
+            if 'start_time' in session:
+                current_time = datetime.datetime.strptime(session['start_time'], "%H:%M")
+            end_time = current_time + datetime.timedelta(hours=session.get('hours', 1))
+            time_slot = f"{current_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
+
+            topics = session.get('topics', [])
+            if isinstance(topics, list):
+                topics_text = ", ".join(topics) if topics else "General Study"
+            else:
+                topics_text = str(topics)
+
+            session_data.append([
+                Paragraph(time_slot, styles['normal']),
+                Paragraph(session.get('subject', 'Unknown'), styles['normal']),
+                Paragraph(f"{session.get('hours', 1)}h", styles['normal']),
+                Paragraph(topics_text, styles['normal'])
+            ])
+
+            current_time = end_time + datetime.timedelta(minutes=15)
+
+        daily_table = Table(session_data, colWidths=[1.8*inch, 1.5*inch, 0.7*inch, 3*inch])
+        daily_table.setStyle(styles['daily_table'])
+        flowables.append(daily_table)
+        flowables.append(Spacer(1, 20))
+        return flowables
@@ -1,31 +1,33 @@
 # study_planner/study_planner.py
-import json
-import os
 import datetime
+import heapq
+import math
 import re
-from dateutil import parser
-from config import STUDY_PLAN_FILE
+from collections import deque
+from config import STUDY_PLAN_FILE, STUDY_HOURS_PER_DAY, STUDY_START_TIME, STUDY_BREAK_MINUTES
+from config import STUDY_HOURS_PER_TOPIC, STUDY_SESSION_HOURS
+from utilities.json_store import JsonStore
 from .topic_fetcher import TopicFetcher
 from .pdf_generator import PDFGenerator
 
+DIFFICULTY_MULTIPLIERS = {
+    "hard": 1.5,
+    "medium": 1.0,
+    "easy": 0.7
+}
+
 class StudyPlanner:
     def __init__(self):
         self.study_plan_file = STUDY_PLAN_FILE
+        self.store = JsonStore(self.study_plan_file)
         self.topic_fetcher = TopicFetcher()
         self.pdf_generator = PDFGenerator()
     
     def load_study_plan(self):
-        if os.path.exists(self.study_plan_file):
-            try:
-                with open(self.study_plan_file, "r") as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        return self.store.load()
     
     def save_study_plan(self, plan):
-        with open(self.study_plan_file, "w") as f:
-            json.dump(plan, f, indent=4)
+        self.store.save(plan)
     
     def parse_spoken_date(self, date_text):
         if not date_text:
@@ -67,6 +69,7 @@ class StudyPlanner:
                     except ValueError:
                         continue
         
+        from dateutil import parser
         try:
             parsed_date = parser.parse(date_text, fuzzy=True)
             exam_date = parsed_date.date()
@@ -81,27 +84,51 @@ class StudyPlanner:
             print(f"❌ Could not parse date: {date_text}")
             return None
     
+    def split_subjects(self, subject_text):
+        """'physics, chemistry and maths' -> ['physics', 'chemistry', 'maths']
+
+        Only a comma list is split, with "and"/"&" allowed before its last
+        item, so 'signals and systems' stays one subject. That last item is
+        also kept whole if the current plan already has a subject by that name.
+        """
+        parts = subject_text.split(",")
+        if len(parts) > 1:
+            last = re.sub(r'^\s*(?:and|&)\s+', '', parts.pop(), flags=re.IGNORECASE)
+            plan = self.load_study_plan() or {}
+            known = {s['name'].lower() for s in plan.get('subjects', [])}
+            if last.strip().lower() in known:
+                parts.append(last)
+            else:
+                parts.extend(re.split(r'\s+(?:and|&)\s+(?!.*\s(?:and|&)\s)', last, flags=re.IGNORECASE))
+        names = []
+        for part in parts:
+            part = part.strip()
+            if part and part.lower() not in [n.lower() for n in names]:
+                names.append(part)
+        return names
+    
     def create_study_plan_from_single_command(self, subject_name, exam_date):
         try:
+            subject_names = self.split_subjects(subject_name) or [subject_name]
+            new_names = [name.lower() for name in subject_names]
+            
             existing_plan = self.load_study_plan()
             existing_subjects = existing_plan.get('subjects', []) if existing_plan else []
+            existing_subjects = [s for s in existing_subjects if s['name'].lower() not in new_names]
             
-            existing_subject_names = [s['name'].lower() for s in existing_subjects]
-            if subject_name.lower() in existing_subject_names:
-                existing_subjects = [s for s in existing_subjects if s['name'].lower() != subject_name.lower()]
-            
-            topics = self.topic_fetcher.get_subject_topics(subject_name)
+            # All subjects fetched at once, so this takes as long as the slowest one
+            topics_by_subject = self.topic_fetcher.get_topics_for_subjects(subject_names)
             
             difficulty = 'medium'
             
-            subject_data = {
-                'name': subject_name,
+            new_subjects = [{
+                'name': name,
                 'exam_date': exam_date,
-                'topics': topics,
+                'topics': topics_by_subject[name],
                 'difficulty': difficulty
-            }
+            } for name in subject_names]
             
-            all_subjects = existing_subjects + [subject_data]
+            all_subjects = existing_subjects + new_subjects
             
             today = datetime.date.today()
             
@@ -112,7 +139,7 @@ class StudyPlanner:
             if study_days <= 0:
                 return None
             
-            available_hours = 4.0
+            available_hours = STUDY_HOURS_PER_DAY
             
             prioritized_subjects = self.calculate_study_priority(all_subjects)
             for i, subject in enumerate(prioritized_subjects):
@@ -125,11 +152,12 @@ class StudyPlanner:
                 'subjects': prioritized_subjects,
                 'available_hours_per_day': available_hours,
                 'total_study_days': study_days,
-                'daily_schedule': self.allocate_study_hours(prioritized_subjects, available_hours, min(study_days, 30))
+                'daily_schedule': self.replan_study_hours(existing_plan, prioritized_subjects, available_hours, study_days)
             }
             
             self.save_study_plan(study_plan)
-            pdf_filename = self.pdf_generator.create_study_pdf(study_plan)
+            # Drawn on the PDF worker, so the plan is announced without waiting for reportlab
+            self.pdf_generator.render_in_background(study_plan)
             
             return study_plan
             
@@ -147,11 +175,7 @@ class StudyPlanner:
             
             priority_score = max(1, 100 - days_until_exam)
             
-            difficulty_multiplier = {
-                "hard": 1.5,
-                "medium": 1.0,
-                "easy": 0.7
-            }.get(subject.get('difficulty', 'medium'), 1.0)
+            difficulty_multiplier = DIFFICULTY_MULTIPLIERS.get(subject.get('difficulty', 'medium'), 1.0)
             
             priority_score *= difficulty_multiplier
             prioritized_subjects.append({
@@ -163,49 +187,194 @@ class StudyPlanner:
         prioritized_subjects.sort(key=lambda x: x['priority_score'], reverse=True)
         return prioritized_subjects
     
-    def allocate_study_hours(self, subjects, total_hours_per_day, study_days):
+    def allocate_study_hours(self, subjects, total_hours_per_day, study_days, start_date=None, work=None, deadlines=None,
+                             unplanned=None):
+        """Earliest-deadline-first: each day, subjects with the nearest exam get their hours first.
+
+        A subject's share for a day is its remaining hours spread evenly over
+        the days left before its exam, so work is paced rather than crammed
+        at the start; ties go to the higher priority_score. `work` and
+        `deadlines` (keyed by lowercase subject name) override a subject's
+        topic queue and number of study days. Hours that don't fit are
+        printed, or added to `unplanned` ({lowercase name: hours}) if given.
+        """
+        start_date = start_date or datetime.date.today()
+        work = work or {}
+        deadlines = deadlines or {}
         daily_plan = {}
         
-        all_topics = []
-        for subject in subjects:
-            topics = subject.get('topics', [])
-            all_topics.extend([(subject['name'], topic) for topic in topics])
-        
-        topics_per_day = max(1, len(all_topics) // study_days)
+        heap = []
+        queues = {}
+        hours_left = {}
+        for i, subject in enumerate(subjects):
+            name = subject['name'].lower()
+            if name in deadlines:
+                deadline = deadlines[name]
+            else:
+                exam_date = datetime.datetime.strptime(subject['exam_date'], "%Y-%m-%d").date()
+                deadline = (exam_date - start_date).days  # study until the day before the exam
+            queue = work[name] if name in work else self._subject_work(subject)
+            if not queue:
+                continue
+            if deadline <= 0:
+                # The exam is today (or over): no study day is left before it
+                print(f"⚠️ No time left before the {subject['name']} exam; nothing planned")
+                continue
+            queues[i] = queue
+            hours_left[i] = sum(hours for _, hours in queue)
+            heapq.heappush(heap, (deadline, -subject.get('priority_score', 0), i))
         
         for day in range(study_days):
-            day_date = (datetime.date.today() + datetime.timedelta(days=day)).isoformat()
+            day_date = (start_date + datetime.timedelta(days=day)).isoformat()
             daily_plan[day_date] = []
-            
             remaining_hours = total_hours_per_day
-            subjects_today = []
-            
-            start_idx = day * topics_per_day
-            end_idx = min(start_idx + topics_per_day, len(all_topics))
-            
-            day_topics = all_topics[start_idx:end_idx]
-            
-            subject_topics = {}
-            for subject_name, topic in day_topics:
-                if subject_name not in subject_topics:
-                    subject_topics[subject_name] = []
-                subject_topics[subject_name].append(topic)
-            
-            for subject in subjects:
-                subject_name = subject['name']
-                if subject_name in subject_topics:
-                    subject_hours = min(2.0, remaining_hours)
-                    if subject_hours >= 0.5:
-                        daily_plan[day_date].append({
-                            'subject': subject_name,
-                            'hours': round(subject_hours, 1),
-                            'topics': subject_topics[subject_name],
-                            'start_time': '09:00'
-                        })
-                        remaining_hours -= subject_hours
+            studied = []
+            
+            while heap and remaining_hours >= STUDY_SESSION_HOURS:
+                entry = heapq.heappop(heap)
+                deadline, _, i = entry
+                if deadline <= day:
+                    self._report_unplanned(subjects[i]['name'], hours_left[i], unplanned)
+                    continue
+                share = hours_left[i] / (deadline - day)
+                hours = min(math.ceil(share / STUDY_SESSION_HOURS - 1e-9) * STUDY_SESSION_HOURS, remaining_hours, hours_left[i])
+                daily_plan[day_date].append({
+                    'subject': subjects[i]['name'],
+                    'hours': round(hours, 1),
+                    'topics': self._take_topics(queues[i], hours)
+                })
+                hours_left[i] -= hours
+                remaining_hours -= hours
+                if queues[i]:
+                    studied.append(entry)
+            
+            for entry in studied:
+                heapq.heappush(heap, entry)
+            self._assign_start_times(daily_plan[day_date])
+        
+        for _, _, i in heap:
+            self._report_unplanned(subjects[i]['name'], hours_left[i], unplanned)
         
         return daily_plan
     
+    def _report_unplanned(self, subject_name, hours, unplanned=None):
+        if unplanned is None:
+            print(f"⚠️ Not enough time for {subject_name}: {hours:.1f} hours unplanned")
+        else:
+            unplanned[subject_name.lower()] = unplanned.get(subject_name.lower(), 0) + hours
+    
+    def replan_study_hours(self, old_plan, subjects, total_hours_per_day, study_days):
+        """Update old_plan's schedule for a changed subject list without redoing all of it.
+
+        Days before today are kept as studied. Only the days up to the last
+        exam of an added, removed or edited subject are re-allocated; later
+        days keep their sessions. Unchanged subjects keep their later work
+        and must fit their earlier work back into the re-planned days; if
+        that leaves anything out, the window grows up to their exams.
+        """
+        today = datetime.date.today()
+        old_schedule = old_plan.get('daily_schedule', {}) if old_plan else {}
+        if not old_schedule:
+            return self.allocate_study_hours(subjects, total_hours_per_day, study_days)
+        
+        def exam_day(subject):
+            return (datetime.datetime.strptime(subject['exam_date'], "%Y-%m-%d").date() - today).days
+        
+        def signature(subject):
+            return (subject['exam_date'], subject.get('difficulty', 'medium'), subject.get('topics', []))
+        
+        old_subjects = {s['name'].lower(): s for s in old_plan.get('subjects', [])}
+        new_subjects = {s['name'].lower(): s for s in subjects}
+        changed = {name for name in old_subjects.keys() | new_subjects.keys()
+                   if name not in old_subjects or name not in new_subjects
+                   or signature(old_subjects[name]) != signature(new_subjects[name])}
+        
+        if old_plan.get('available_hours_per_day') != total_hours_per_day:
+            window = study_days
+        elif changed:
+            affected = [s for name in changed for s in (old_subjects.get(name), new_subjects.get(name)) if s]
+            window = min(max(max(exam_day(s) for s in affected), 0), study_days)
+        else:
+            window = 0
+        
+        def plan_window(window, unplanned):
+            daily_plan = {}
+            studied_hours = {}
+            later_hours = {}
+            for day_date, sessions in old_schedule.items():
+                day = (datetime.date.fromisoformat(day_date) - today).days
+                if day < 0:
+                    daily_plan[day_date] = sessions
+                    hours_by_subject = studied_hours
+                elif window <= day < study_days:
+                    sessions = [s for s in sessions if s['subject'].lower() in new_subjects]
+                    daily_plan[day_date] = sessions
+                    hours_by_subject = later_hours
+                else:
+                    continue
+                for session in sessions:
+                    name = session['subject'].lower()
+                    hours_by_subject[name] = hours_by_subject.get(name, 0) + session['hours']
+            
+            # What each subject still needs inside the window: its topics minus what was
+            # studied before today (from the front) and what stays scheduled later (from the back)
+            work = {}
+            deadlines = {}
+            for name, subject in new_subjects.items():
+                queue = self._subject_work(subject)
+                self._take_topics(queue, studied_hours.get(name, 0))
+                if name not in changed:
+                    self._take_topics(queue, later_hours.get(name, 0), from_back=True)
+                work[name] = queue
+                deadlines[name] = min(exam_day(subject), window)
+            
+            daily_plan.update(self.allocate_study_hours(subjects, total_hours_per_day, window, today, work, deadlines,
+                                                        unplanned))
+            return dict(sorted(daily_plan.items()))
+        
+        # If something no longer fits, open the window up to those subjects' exams
+        # (at worst the whole plan) rather than drop topics a full rebuild would place
+        while True:
+            unplanned = {}
+            daily_plan = plan_window(window, unplanned)
+            if not unplanned or window >= study_days:
+                break
+            wider = max(exam_day(new_subjects[name]) for name in unplanned)
+            window = min(wider if wider > window else study_days, study_days)
+        
+        for name, hours in unplanned.items():
+            self._report_unplanned(new_subjects[name]['name'], hours)
+        return daily_plan
+    
+    def _subject_work(self, subject):
+        """[topic, hours needed] for each of a subject's topics, hours scaled by difficulty."""
+        hours_per_topic = STUDY_HOURS_PER_TOPIC * DIFFICULTY_MULTIPLIERS.get(subject.get('difficulty', 'medium'), 1.0)
+        hours_per_topic = max(1, round(hours_per_topic / STUDY_SESSION_HOURS)) * STUDY_SESSION_HOURS
+        return deque([topic, hours_per_topic] for topic in subject.get('topics', []))
+    
+    def _take_topics(self, work, hours, from_back=False):
+        """Pop `hours` of study off a subject's [topic, hours needed] queue; returns the topics touched."""
+        end = -1 if from_back else 0
+        topics = []
+        while work and hours > 1e-9:
+            topic, needed = work[end]
+            topics.append(topic)
+            if needed <= hours + 1e-9:
+                if from_back:
+                    work.pop()
+                else:
+                    work.popleft()
+            else:
+                work[end][1] = needed - hours
+            hours -= needed
+        return topics
+    
+    def _assign_start_times(self, sessions):
+        current_time = datetime.datetime.strptime(STUDY_START_TIME, "%H:%M")
+        for session in sessions:
+            session['start_time'] = current_time.strftime("%H:%M")
+            current_time += datetime.timedelta(hours=session['hours'], minutes=STUDY_BREAK_MINUTES)
+    
     def get_todays_study_schedule(self):
         study_plan = self.load_study_plan()
         if not study_plan:
@@ -219,9 +388,11 @@ class StudyPlanner:
         
         sessions_text = []
         total_hours = 0
-        current_time = datetime.datetime.strptime("09:00", "%H:%M")
+        current_time = datetime.datetime.strptime(STUDY_START_TIME, "%H:%M")
         
         for session in daily_schedule:
+            if 'start_time' in session:
+                current_time = datetime.datetime.strptime(session['start_time'], "%H:%M")
             end_time = current_time + datetime.timedelta(hours=session['hours'])
             time_slot = f"{current_time.strftime('%I:%M %p')} - {end_time.strftime('%I:%M %p')}"
             topics = ", ".join(session['topics']) if session['topics'] else "General Study"
@@ -233,20 +404,14 @@ class StudyPlanner:
         return schedule_text
     
     def remind_study_schedule(self, tts):
+        """Queue today's schedule as background speech; returns its Future, or None."""
         schedule = self.get_todays_study_schedule()
         if schedule and "No study sessions" not in schedule:
-            tts.speak("Here's your study schedule for today:")
-            import time
-            time.sleep(1)
-            lines = schedule.split('\n')
-            tts.speak(lines[0])
-            time.sleep(0.5)
-            for line in lines[1:]:
-                tts.speak(line)
-                time.sleep(0.5)
+            # One line per sentence; it plays while Friday is already listening
+            return tts.speak_background("Here's your study schedule for today:\n" + schedule)
+        return None
     
     def clear_study_plan(self):
-        if os.path.exists(self.study_plan_file):
-            os.remove(self.study_plan_file)
+        if self.store.delete():
             return "Study plan cleared successfully."
         return "No study plan found to clear."
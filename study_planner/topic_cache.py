@@ -0,0 +1,51 @@
+# study_planner/topic_cache.py
+import re
+import time
+from config import TOPIC_CACHE_FILE, TOPIC_CACHE_TTL_DAYS, TOPIC_CACHE_MAX_ENTRIES
+from utilities.json_store import JsonStore
+
+
+class TopicCache:
+    """Topics per subject on disk, so re-planning doesn't hit Google and Gemini again.
+
+    Entries expire after `ttl_days`; past `max_entries` the least recently
+    used subjects are dropped.
+    """
+
+    def __init__(self, path=TOPIC_CACHE_FILE, ttl_days=TOPIC_CACHE_TTL_DAYS, max_entries=TOPIC_CACHE_MAX_ENTRIES):
+        self.store = JsonStore(path)
+        self.ttl = ttl_days * 86400
+        self.max_entries = max_entries
+
+    @staticmethod
+    def normalize(subject_name):
+        """'  Data  Structures!' and 'data structures' share one entry."""
+        return re.sub(r'\s+', ' ', re.sub(r'[^\w\s]', ' ', subject_name.lower())).strip()
+
+    def get(self, subject_name):
+        key = self.normalize(subject_name)
+        with self.store.lock:
+            entry = self.store.load().get(key)
+            if not entry:
+                return None
+            if time.time() - entry.get("fetched_at", 0) > self.ttl:
+                del self.store.load()[key]
+                self.store.save()
+                return None
+            entry["used_at"] = time.time()
+            self.store.save()
+            return list(entry["topics"])
+
+    def put(self, subject_name, topics):
+        now = time.time()
+        with self.store.lock:
+            entries = self.store.load()
+            entries[self.normalize(subject_name)] = {"topics": list(topics), "fetched_at": now, "used_at": now}
+            if len(entries) > self.max_entries:
+                by_use = sorted(entries, key=lambda k: entries[k].get("used_at", 0))
+                for key in by_use[:len(entries) - self.max_entries]:
+                    del entries[key]
+            self.store.save()
+
+    def clear(self):
+        self.store.delete()
@@ -1,45 +1,114 @@
 # study_planner/topic_fetcher.py
-import requests
+import json
 import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
 from config import GOOGLE_API_KEY, GOOGLE_SEARCH_ENGINE_ID, GEMINI_API_KEY, GEMINI_ENDPOINT
+from config import TOPIC_FETCH_DEADLINE, TOPIC_FETCH_WORKERS
+from system.tracing import traced
+from .topic_cache import TopicCache
+
+# Structured output for get_topics_from_ai_batch: [{"subject": ..., "topics": [...]}, ...]
+BATCH_TOPICS_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "subject": {"type": "STRING"},
+            "topics": {"type": "ARRAY", "items": {"type": "STRING"}}
+        },
+        "required": ["subject", "topics"]
+    }
+}
 
 class TopicFetcher:
     def __init__(self):
-        pass
+        self.cache = TopicCache()
     
     def get_subject_topics(self, subject_name):
-        try:
-            all_topics = set()
-            
-            # Try Google API first
-            api_topics = self.get_topics_from_google_api(subject_name)
-            if api_topics:
-                all_topics.update(api_topics)
-                print(f"✅ Google API found {len(api_topics)} topics")
-            
-            # Fallback to AI if API doesn't give enough results
-            if len(all_topics) < 5:
-                print("🔍 API didn't find enough topics, trying AI...")
-                ai_topics = self.get_topics_from_ai(subject_name)
-                if ai_topics:
-                    all_topics.update(ai_topics)
-                    print(f"✅ AI found {len(ai_topics)} additional topics")
-            
-            # Final fallback to generated topics
-            if len(all_topics) < 3:
-                print("🔍 Using generated topics as fallback...")
-                generated = self.generate_topics_from_subject_name(subject_name)
-                all_topics.update(generated)
-            
-            final_topics = self.prioritize_and_organize_topics(list(all_topics), subject_name)
-            
-            print(f"✅ Final topics: {len(final_topics)}")
-            return final_topics
-                
-        except Exception as e:
-            print(f"❌ Error fetching topics for {subject_name}: {e}")
-            return self.generate_topics_from_subject_name(subject_name)
+        return self.get_topics_for_subjects([subject_name])[subject_name]
+    
+    def get_topics_for_subjects(self, subject_names):
+        """Topics for one or more subjects, fetched together; returns {subject_name: topics}."""
+        results = {}
+        missing = []
+        for name in subject_names:
+            cached = self.cache.get(name)
+            if cached:
+                print(f"✅ Using cached topics for {name}")
+                results[name] = cached
+            else:
+                missing.append(name)
+        if missing:
+            try:
+                results.update(self._fetch_topics(missing))
+            except Exception as e:
+                print(f"❌ Error fetching topics for {', '.join(missing)}: {e}")
+                for name in missing:
+                    results[name] = self.generate_topics_from_subject_name(name)
+        return {name: results[name] for name in subject_names}
+    
+    def _fetch_topics(self, subject_names):
+        found = {name: set() for name in subject_names}
+        deadline = time.monotonic() + TOPIC_FETCH_DEADLINE
+        
+        # Google per subject and Gemini (one request for all subjects) at once;
+        # whatever hasn't answered by the deadline is left out
+        pool = ThreadPoolExecutor(max_workers=TOPIC_FETCH_WORKERS + 1, thread_name_prefix="topics")
+        sources = {pool.submit(self.get_topics_from_google_api, name): ("Google API", name) for name in subject_names}
+        if len(subject_names) == 1:
+            sources[pool.submit(self.get_topics_from_ai, subject_names[0])] = ("AI", subject_names[0])
+        else:
+            sources[pool.submit(self.get_topics_from_ai_batch, subject_names)] = ("AI", None)
+        pending = set(sources)
+        while pending:
+            done, pending = wait(pending, timeout=max(0, deadline - time.monotonic()), return_when=FIRST_COMPLETED)
+            if not done:
+                break
+            for future in done:
+                source, name = sources[future]
+                if name is None:
+                    topics_by_subject = future.result()
+                    if topics_by_subject is None:
+                        # Batch request failed; fall back to one request per subject
+                        for subject in subject_names:
+                            retry = pool.submit(self.get_topics_from_ai, subject)
+                            sources[retry] = ("AI", subject)
+                            pending.add(retry)
+                        continue
+                    for subject, topics in topics_by_subject.items():
+                        found[subject].update(topics)
+                        print(f"✅ AI found {len(topics)} topics for {subject}")
+                else:
+                    topics = future.result()
+                    if topics:
+                        found[name].update(topics)
+                        print(f"✅ {source} found {len(topics)} topics for {name}")
+        pool.shutdown(wait=False)
+        for future in pending:
+            source, name = sources[future]
+            print(f"⏰ {source} topics for {name or 'all subjects'} timed out after {TOPIC_FETCH_DEADLINE}s")
+        
+        return {name: self._finish_topics(name, topics) for name, topics in found.items()}
+    
+    def _finish_topics(self, subject_name, all_topics):
+        # Only real search/AI results are worth keeping; generated ones are free to rebuild
+        found_topics = len(all_topics) >= 3
+        
+        # Final fallback to generated topics
+        if len(all_topics) < 3:
+            print("🔍 Using generated topics as fallback...")
+            generated = self.generate_topics_from_subject_name(subject_name)
+            all_topics.update(generated)
+        
+        final_topics = self.prioritize_and_organize_topics(list(all_topics), subject_name)
+        if found_topics:
+            self.cache.put(subject_name, final_topics)
+        
+        print(f"✅ Final topics for {subject_name}: {len(final_topics)}")
+        return final_topics
     
+    @traced("topics_google")
     def get_topics_from_google_api(self, subject_name):
         try:
             if not GOOGLE_API_KEY or not GOOGLE_SEARCH_ENGINE_ID:
@@ -56,6 +125,7 @@ class TopicFetcher:
                 'num': 5
             }
             
+            import requests
             response = requests.get(search_url, params=params, timeout=10)
             data = response.json()
             
@@ -81,6 +151,7 @@ class TopicFetcher:
             print(f"❌ Google API error: {e}")
             return []
     
+    @traced("topics_gemini")
     def get_topics_from_ai(self, subject_name):
         try:
             if not GEMINI_API_KEY:
@@ -96,6 +167,7 @@ class TopicFetcher:
             }
             url = f"{GEMINI_ENDPOINT}?key={GEMINI_API_KEY}"
             
+            import requests
             response = requests.post(url, json=payload, headers=headers, timeout=30)
             data = response.json()
             
@@ -108,6 +180,50 @@ class TopicFetcher:
         except:
             return []
     
+    @traced("topics_gemini_batch")
+    def get_topics_from_ai_batch(self, subject_names):
+        """One Gemini request for several subjects; {subject_name: topics}, or None if it failed."""
+        try:
+            if not GEMINI_API_KEY:
+                return {}
+            
+            subject_list = "\n".join(f"- {name}" for name in subject_names)
+            prompt = f"""For each subject below, list the 10 most important topics someone should study for it.
+            Use each subject name exactly as written.
+            {subject_list}"""
+            
+            headers = {"Content-Type": "application/json"}
+            payload = {
+                "contents": [{"parts": [{"text": prompt}]}],
+                "generationConfig": {
+                    "maxOutputTokens": 300 * len(subject_names),
+                    "responseMimeType": "application/json",
+                    "responseSchema": BATCH_TOPICS_SCHEMA
+                }
+            }
+            url = f"{GEMINI_ENDPOINT}?key={GEMINI_API_KEY}"
+            
+            import requests
+            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            data = response.json()
+            
+            if not data.get("candidates"):
+                print(f"❌ Batched topic request failed: {data.get('error', {}).get('message', 'no candidates')}")
+                return None
+            
+            content = data["candidates"][0]["content"]["parts"][0]["text"]
+            by_key = {TopicCache.normalize(name): name for name in subject_names}
+            topics_by_subject = {}
+            for entry in json.loads(content):
+                name = by_key.get(TopicCache.normalize(entry.get("subject", "")))
+                if name:
+                    topics_by_subject[name] = self.parse_ai_response("\n".join(entry.get("topics", [])))
+            return topics_by_subject
+            
+        except Exception as e:
+            print(f"❌ Batched topic request failed: {e}")
+            return None
+    
     def parse_ai_response(self, ai_text):
         topics = []
         lines = ai_text.split('\n')
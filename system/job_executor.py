@@ -0,0 +1,115 @@
+# system/job_executor.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from config import JOB_WORKERS
+
+
+class Job:
+    def __init__(self, kind, description, cancel=None, progress=None):
+        self.kind = kind
+        self.description = description
+        self.cancel_func = cancel
+        self.progress_func = progress
+        self.started = time.monotonic()
+        self.cancel_requested = False
+        self.future = None
+
+    def is_running(self):
+        return self.future is not None and not self.future.done()
+
+    def elapsed(self):
+        return int(time.monotonic() - self.started)
+
+
+class JobExecutor:
+    """Runs slow intent work (file search, study plans, email) off the voice loop.
+
+    run() starts the work and returns a spoken acknowledgement right away;
+    when the work finishes, announce(result, job) builds the text Friday
+    speaks. With background=False (batch mode) the work runs inline and
+    run() returns the announcement itself.
+    """
+
+    def __init__(self, tts, background=True, max_workers=JOB_WORKERS):
+        self.tts = tts
+        self.background = background
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="friday-job")
+        self.jobs = {}  # latest job per kind
+        self.lock = threading.Lock()
+
+    def run(self, kind, description, func, announce, cancel=None, progress=None):
+        job = Job(kind, description, cancel, progress)
+        if not self.background:
+            return announce(func(), job)
+
+        with self.lock:
+            running = self.jobs.get(kind)
+            if running and running.is_running():
+                if running.cancel_func:
+                    return f"I'm still {running.description}. Say 'cancel {kind}' to stop it."
+                return f"I'm still {running.description}. I'll tell you when it's done."
+            self.jobs[kind] = job
+            job.future = self.pool.submit(func)
+        job.future.add_done_callback(lambda future: self._finish(job, future, announce))
+        print(f"⏳ Background job started: {description}")
+        return f"I'm {description} in the background. I'll let you know when it's done."
+
+    def _finish(self, job, future, announce):
+        if future.cancelled():
+            return
+        try:
+            text = announce(future.result(), job)
+            print(f"✅ Background job finished: {job.description}")
+        except Exception as e:
+            print(f"❌ Background job failed ({job.description}): {e}")
+            text = f"Sorry, something went wrong while {job.description}."
+        if not text:
+            return
+        # Done-callbacks swallow exceptions, so a failed announcement would vanish silently
+        try:
+            self.tts.speak(text)
+        except Exception as e:
+            print(f"❌ Could not announce background job ({job.description}): {e}")
+            print(text)
+
+    def status(self, kind=None):
+        with self.lock:
+            if kind:
+                jobs = [self.jobs[kind]] if kind in self.jobs else []
+            else:
+                jobs = list(self.jobs.values())
+        if not jobs:
+            return f"There's no {kind} running." if kind else "I'm not working on anything in the background."
+
+        lines = []
+        for job in jobs:
+            if job.is_running():
+                line = f"Still {job.description}, {job.elapsed()} seconds so far"
+                if job.progress_func:
+                    line += f", {job.progress_func()}"
+                lines.append(line + ".")
+            elif kind:
+                lines.append(f"Finished {job.description}.")
+        return " ".join(lines) or "I'm not working on anything in the background."
+
+    def cancel(self, kind):
+        with self.lock:
+            job = self.jobs.get(kind)
+        if not job or not job.is_running():
+            return f"There's no {kind} running."
+        job.cancel_requested = True
+        # Jobs that are already running stop through their own cancel hook
+        if not job.future.cancel() and job.cancel_func:
+            job.cancel_func()
+        return f"Okay, I've stopped {job.description}."
+
+    def shutdown(self):
+        """Drop queued jobs and stop cancellable ones; emails and plans already running finish."""
+        with self.lock:
+            jobs = list(self.jobs.values())
+        for job in jobs:
+            if job.is_running() and job.cancel_func:
+                job.cancel_requested = True
+                job.cancel_func()
+        self.pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,56 @@
+# system/startup.py
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from config import STARTUP_WORKERS
+from system.tracing import span
+
+
+class StartupOrchestrator:
+    """Runs independent warm-up tasks in parallel while the assistant is already listening.
+
+    Tasks are plain callables (load a store, build the recognizer, fill the
+    TTS cache). A failing task is reported and skipped; its subsystem is
+    simply built on first use instead.
+    """
+
+    def __init__(self, max_workers=STARTUP_WORKERS):
+        self.max_workers = max_workers
+        self.tasks = []
+        self.timings = {}
+        self.futures = []
+        self._lock = threading.Lock()
+        self._started = None
+
+    def add(self, name, func):
+        self.tasks.append((name, func))
+
+    def start(self):
+        self._started = time.perf_counter()
+        executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="friday-startup")
+        self.futures = [executor.submit(self._run_task, name, func) for name, func in self.tasks]
+        # Workers exit once the queued tasks are done
+        executor.shutdown(wait=False)
+        return self
+
+    def wait(self, timeout=None):
+        """Wait for every task; returns {name: seconds} for those that finished."""
+        wait(self.futures, timeout=timeout)
+        with self._lock:
+            return dict(self.timings)
+
+    def _run_task(self, name, func):
+        start = time.perf_counter()
+        try:
+            with span("startup", task=name):
+                func()
+        except Exception as e:
+            print(f"⚠️ Startup task '{name}' failed: {e}")
+        finally:
+            with self._lock:
+                self.timings[name] = time.perf_counter() - start
+                finished = len(self.timings) == len(self.tasks)
+            if finished:
+                total = time.perf_counter() - self._started
+                slowest = max(self.timings, key=self.timings.get)
+                print(f"🚀 Startup warm-up done in {total:.2f}s (slowest: {slowest}, {self.timings[slowest]:.2f}s)")
@@ -0,0 +1,200 @@
+# system/tracing.py
+"""Per-stage latency spans for voice turns, written as JSON lines to a rotating trace file.
+
+    with span("stt", backend="google"):
+        ...
+
+    @traced("weather")
+    def get_weather(self, city): ...
+
+Summarize the trace with:
+
+    python -m system.tracing                 # p50/p95 per stage
+    python -m system.tracing --turns 50      # only the last 50 turns
+"""
+import argparse
+import contextlib
+import functools
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from logging.handlers import RotatingFileHandler
+from config import TRACE_ENABLED, TRACE_FILE, TRACE_MAX_BYTES, TRACE_BACKUP_COUNT
+from utilities.stats import percentile
+
+
+class Tracer:
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backup_count=TRACE_BACKUP_COUNT,
+                 enabled=TRACE_ENABLED):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.enabled = enabled
+        self._local = threading.local()
+        self._logger = None
+        self._lock = threading.Lock()
+
+    def _get_logger(self):
+        # The file is only created once the first span is written
+        with self._lock:
+            if self._logger is None:
+                logger = logging.getLogger(f"friday.trace.{id(self)}")
+                logger.setLevel(logging.INFO)
+                logger.propagate = False
+                handler = RotatingFileHandler(self.path, maxBytes=self.max_bytes,
+                                              backupCount=self.backup_count, delay=True)
+                handler.setFormatter(logging.Formatter("%(message)s"))
+                logger.addHandler(handler)
+                self._logger = logger
+            return self._logger
+
+    def _stack(self):
+        if not hasattr(self._local, "stack"):
+            self._local.stack = []
+        return self._local.stack
+
+    @contextlib.contextmanager
+    def turn(self):
+        """Group the spans of one voice turn under a shared turn id."""
+        self._local.turn = uuid.uuid4().hex[:12]
+        try:
+            with self.span("turn"):
+                yield
+        finally:
+            self._local.turn = None
+
+    def current_turn(self):
+        return getattr(self._local, "turn", None)
+
+    def bind_turn(self, func):
+        """Wrap func so spans it records on another thread (queue worker, pool) join the current turn."""
+        turn = self.current_turn()
+        if turn is None:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            previous = self.current_turn()
+            self._local.turn = turn
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._local.turn = previous
+        return wrapper
+
+    @contextlib.contextmanager
+    def span(self, stage, **attrs):
+        """Time the block; attributes can still be added to the yielded dict inside it."""
+        if not self.enabled:
+            yield attrs
+            return
+        stack = self._stack()
+        parent = stack[-1] if stack else None
+        stack.append(stage)
+        ok = True
+        start = time.perf_counter()
+        try:
+            yield attrs
+        except Exception:
+            ok = False
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            record = {
+                "ts": round(time.time(), 3),
+                "turn": self.current_turn(),
+                "stage": stage,
+                "parent": parent,
+                "ms": round(elapsed * 1000, 3),
+                "ok": ok,
+            }
+            record.update(attrs)
+            try:
+                self._get_logger().info(json.dumps(record, default=str))
+            except Exception as e:
+                print(f"⚠️ Could not write trace span: {e}")
+
+    def trace_files(self):
+        """Trace files from oldest to newest, including rotated backups."""
+        paths = [f"{self.path}.{i}" for i in range(self.backup_count, 0, -1)] + [self.path]
+        return [path for path in paths if os.path.exists(path)]
+
+    def load_spans(self):
+        spans = []
+        for path in self.trace_files():
+            with open(path, "r") as f:
+                for line in f:
+                    try:
+                        spans.append(json.loads(line))
+                    except ValueError:
+                        continue
+        return spans
+
+
+_tracer = None
+
+
+def get_tracer():
+    global _tracer
+    if _tracer is None:
+        _tracer = Tracer()
+    return _tracer
+
+
+def span(stage, **attrs):
+    return get_tracer().span(stage, **attrs)
+
+
+def bind_turn(func):
+    return get_tracer().bind_turn(func)
+
+
+def traced(stage):
+    """Decorator form of span() for service methods."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(stage):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def summarize(spans, last_turns=None):
+    """Count and p50/p95/max milliseconds per stage, slowest p95 first."""
+    if last_turns:
+        turn_ids = list(dict.fromkeys(record["turn"] for record in spans if record.get("turn")))
+        keep = set(turn_ids[-last_turns:])
+        spans = [record for record in spans if record.get("turn") in keep]
+
+    samples = {}
+    for record in spans:
+        samples.setdefault(record["stage"], []).append(record["ms"])
+    if not samples:
+        return "No spans recorded yet."
+
+    rows = []
+    for stage, values in samples.items():
+        values.sort()
+        rows.append((stage, len(values), percentile(values, 50), percentile(values, 95), values[-1]))
+    rows.sort(key=lambda row: -row[3])
+
+    lines = [f"{'stage':<24}{'count':>8}{'p50 ms':>12}{'p95 ms':>12}{'max ms':>12}"]
+    for stage, count, p50, p95, worst in rows:
+        lines.append(f"{stage:<24}{count:>8}{p50:>12.1f}{p95:>12.1f}{worst:>12.1f}")
+    return "\n".join(lines)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Per-stage latency summary of the Friday trace file")
+    parser.add_argument("--file", default=TRACE_FILE)
+    parser.add_argument("--turns", type=int, help="only the most recent N voice turns")
+    args = parser.parse_args()
+
+    tracer = Tracer(path=args.file)
+    print(f"📈 {', '.join(tracer.trace_files()) or args.file}")
+    print(summarize(tracer.load_spans(), last_turns=args.turns))
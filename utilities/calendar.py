@@ -2,11 +2,13 @@
 import datetime
 import requests
 from config import CALENDARIFIC_API_KEY, COUNTRY_CODE
+from system.tracing import traced
 
 class CalendarService:
     def __init__(self):
         pass
     
+    @traced("calendar")
     def get_important_days(self):
         today = datetime.date.today().strftime("%Y-%m-%d")
         if not CALENDARIFIC_API_KEY:
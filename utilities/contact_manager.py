@@ -1,29 +1,27 @@
 # utilities/contact_manager.py
-import json
-import os
 import re
 import speech_recognition as sr
+from speech.audio_capture import get_audio_capture
 from config import CONTACTS_FILE
+from utilities.json_store import JsonStore
 
 class ContactManager:
     def __init__(self):
         self.contacts_file = CONTACTS_FILE
-        self.contacts = self.load_contacts()
+        self.store = JsonStore(self.contacts_file)
+    
+    @property
+    def contacts(self):
+        # Cached; re-read only if contacts.json was edited on disk
+        return self.store.load()
     
     def load_contacts(self):
-        if os.path.exists(self.contacts_file):
-            try:
-                with open(self.contacts_file, "r") as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
+        return self.contacts
     
     def save_contacts(self):
-        with open(self.contacts_file, "w") as f:
-            json.dump(self.contacts, f, indent=4)
+        self.store.save()
     
-    def find_email(self, name, tts=None):
+    def find_email(self, name, tts=None, speech_recognizer=None):
         name_lower = name.lower().strip()
         
         # 1. Check existing contacts
@@ -36,10 +34,12 @@ class ContactManager:
         # 2. Ask user for email
         if tts:
             tts.speak(f"I don't have an email for {name}. What is their email address? Please say it clearly.")
-            email = self._listen_for_email()
+            tts.wait_until_idle()
+            email = self._listen_for_email(speech_recognizer)
             if email and self._validate_email(email):
-                self.contacts[name_lower] = email
-                self.save_contacts()
+                with self.store.lock:
+                    self.contacts[name_lower] = email
+                    self.save_contacts()
                 tts.speak(f"Saved {name}'s email. Now I'll remember it.")
                 return email
             else:
@@ -47,27 +47,34 @@ class ContactManager:
         
         return None
     
-    def _listen_for_email(self):
+    def _listen_for_email(self, speech_recognizer=None):
         recognizer = sr.Recognizer()
-        with sr.Microphone() as source:
-            print("🎤 Listening for email address...")
-            recognizer.adjust_for_ambient_noise(source, duration=1.0)
-            try:
-                audio = recognizer.listen(source, timeout=10)
+        print("🎤 Listening for email address...")
+        try:
+            if speech_recognizer is not None:
+                # Same audio source as the assistant (microphone, WAV replay or none in batch mode)
+                email_text = speech_recognizer.listen_for_command()
+                if not email_text:
+                    return None
+                email_text = email_text.lower()
+            else:
+                audio = get_audio_capture().listen(timeout=10)
+                if audio is None:
+                    return None
                 email_text = recognizer.recognize_google(audio).lower()
-                print(f"📧 Heard email: {email_text}")
-                
-                # Clean up the email
-                email_text = email_text.replace(" at ", "@").replace(" dot ", ".").replace(" ", "")
-                email_text = re.sub(r'\s+', '', email_text)
-                
-                return email_text
-            except sr.WaitTimeoutError:
-                print("⏰ Email listening timeout")
-                return None
-            except Exception as e:
-                print(f"❌ Email recognition error: {e}")
-                return None
+            print(f"📧 Heard email: {email_text}")
+            
+            # Clean up the email
+            email_text = email_text.replace(" at ", "@").replace(" dot ", ".").replace(" ", "")
+            email_text = re.sub(r'\s+', '', email_text)
+            
+            return email_text
+        except sr.WaitTimeoutError:
+            print("⏰ Email listening timeout")
+            return None
+        except Exception as e:
+            print(f"❌ Email recognition error: {e}")
+            return None
     
     def _validate_email(self, email):
         pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
@@ -86,8 +93,9 @@ class ContactManager:
     
     def delete_contact(self, name):
         name_lower = name.lower()
-        if name_lower in self.contacts:
-            del self.contacts[name_lower]
-            self.save_contacts()
-            return f"Deleted contact for {name}"
+        with self.store.lock:
+            if name_lower in self.contacts:
+                del self.contacts[name_lower]
+                self.save_contacts()
+                return f"Deleted contact for {name}"
         return f"No contact found for {name}"
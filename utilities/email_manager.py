@@ -1,15 +1,18 @@
 # utilities/email_manager.py
-import smtplib
 import os
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
 from config import EMAIL_CONFIG
+from system.tracing import traced
 
 class EmailManager:
     def __init__(self):
         self.config = EMAIL_CONFIG
     
+    @traced("smtp")
     def send_email(self, recipient, subject, body):
+        # Loaded on first send rather than at startup
+        import smtplib
+        from email.mime.text import MIMEText
+        from email.mime.multipart import MIMEMultipart
         try:
             # Validate credentials
             if not self.config['sender_email'] or not self.config['sender_password']:
@@ -0,0 +1,121 @@
+# utilities/json_store.py
+import atexit
+import json
+import os
+import tempfile
+import threading
+import weakref
+from config import JSON_STORE_FLUSH_DELAY
+
+_stores = weakref.WeakSet()
+
+
+class JsonStore:
+    """One JSON file, cached in memory and shared between threads.
+
+    load() only re-reads the file when its mtime or size changed on disk.
+    save() marks the data dirty and writes it after `flush_delay` seconds,
+    so a burst of changes becomes one write. Writes go to a temp file that
+    is renamed over the original, so a crash never leaves half a file.
+    Pending writes are flushed at exit.
+    """
+
+    def __init__(self, path, default=dict, flush_delay=JSON_STORE_FLUSH_DELAY):
+        self.path = path
+        self.default = default
+        self.flush_delay = flush_delay
+        self.lock = threading.RLock()
+        self._data = None
+        self._stat = None
+        self._dirty = False
+        self._timer = None
+        _stores.add(self)
+
+    def _file_stat(self):
+        try:
+            st = os.stat(self.path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def load(self):
+        """The cached data; the same object is returned until the file changes."""
+        with self.lock:
+            if self._dirty:
+                return self._data  # our pending write wins over the file
+            stat = self._file_stat()
+            if self._data is None or stat != self._stat:
+                self._data = self._read()
+                self._stat = stat
+            return self._data
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return self.default()
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Could not read {self.path}: {e}")
+            return self.default()
+
+    def save(self, data=None):
+        """Replace (or, with no argument, keep) the cached data and schedule a write."""
+        with self.lock:
+            if data is not None:
+                self._data = data
+            elif self._data is None:
+                return
+            self._dirty = True
+            if self.flush_delay <= 0:
+                self.flush()
+            elif self._timer is None:
+                self._timer = threading.Timer(self.flush_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not self._dirty:
+                return
+            directory = os.path.dirname(os.path.abspath(self.path))
+            fd, tmp_path = tempfile.mkstemp(prefix=".tmp-", suffix=".json", dir=directory)
+            try:
+                os.chmod(tmp_path, 0o644)  # mkstemp creates it owner-only
+                with os.fdopen(fd, "w") as f:
+                    json.dump(self._data, f, indent=4)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"❌ Could not write {self.path}: {e}")
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                return
+            self._dirty = False
+            self._stat = self._file_stat()
+
+    def delete(self):
+        """Drop pending writes and remove the file; returns False if there was nothing to remove."""
+        with self.lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            self._dirty = False
+            self._data = None
+            self._stat = None
+            if os.path.exists(self.path):
+                os.remove(self.path)
+                return True
+            return False
+
+
+@atexit.register
+def flush_all():
+    for store in list(_stores):
+        store.flush()
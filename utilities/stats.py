@@ -0,0 +1,10 @@
+# utilities/stats.py
+import math
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list; 0.0 when it is empty."""
+    if not sorted_values:
+        return 0.0
+    index = max(0, int(math.ceil(pct / 100.0 * len(sorted_values))) - 1)
+    return sorted_values[index]
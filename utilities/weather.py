@@ -1,11 +1,13 @@
 # utilities/weather.py
 import requests
 from config import WEATHER_API_KEY
+from system.tracing import traced
 
 class WeatherService:
     def __init__(self):
         pass
     
+    @traced("weather")
     def get_weather(self, city):
         if not WEATHER_API_KEY:
             return "Weather API key not set. Please configure WEATHER_API_KEY."
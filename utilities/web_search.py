@@ -1,22 +1,25 @@
 # utilities/web_search.py
 import webbrowser
-import wikipedia
 import re
+from system.tracing import traced
 
 class WebSearch:
     def __init__(self):
         pass
     
+    @traced("google_search")
     def google_search(self, query):
         if not query or len(query) < 2:
             return "Please specify what you want to search for."
         webbrowser.open(f"https://www.google.com/search?q={query}")
         return f"Searching Google for: {query}"
     
+    @traced("wikipedia")
     def wikipedia_search(self, topic):
         if not topic or len(topic) < 2:
             return "Please specify what you want to know about."
         try:
+            import wikipedia  # slow to import; only loaded when asked
             info = wikipedia.summary(topic, sentences=2)
             return info
         except: